@@ -1,9 +1,12 @@
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.cache import TTLCache
+from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS
 from app.database import SessionLocal
 from app import models
 from sqlalchemy.exc import SQLAlchemyError
@@ -31,24 +34,71 @@ def decode_access_token(token: str):
     except Exception:
         return None
 
-# DB session getter
-def get_db():
+@dataclass(frozen=True)
+class CurrentUser:
+    """Lightweight snapshot of the authenticated user, safe to share between requests."""
+    id: int
+    email: str
+    name: str
+    gender: Optional[str]
+
+# Verified token -> claims, and user_id -> CurrentUser, so hot requests skip JWT and DB work
+token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+def invalidate_token(token: str):
+    token_cache.invalidate(token)
+
+def invalidate_user(user_id: int):
+    # Call whenever a user row changes or is deleted
+    user_cache.invalidate(user_id)
+
+def get_token_claims(token: str):
+    payload = token_cache.get(token)
+    if payload is not None:
+        # A cached entry never outlives the token's own exp
+        if payload.get("exp", 0) > time.time():
+            return payload
+        token_cache.invalidate(token)
+        return None
+
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(token, payload, ttl_seconds=min(AUTH_CACHE_TTL_SECONDS, remaining))
+    return payload
+
+def load_user_snapshot(user_id: int) -> Optional[CurrentUser]:
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
     db = SessionLocal()
     try:
-        yield db
+        user = db.query(models.User).filter(models.User.id == user_id).first()
     finally:
         db.close()
 
+    if not user:
+        return None
+
+    snapshot = CurrentUser(id=user.id, email=user.email, name=user.name, gender=user.gender)
+    user_cache.set(user_id, snapshot)
+    return snapshot
+
 # Get Current Logged-in User from Token
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+def get_current_user(token: str = Depends(oauth2_scheme)) -> CurrentUser:
     try:
-        payload = decode_access_token(token)
+        payload = get_token_claims(token)
         if payload is None or payload.get("user_id") is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
         user_id = payload.get("user_id")
         try:
-            user = db.query(models.User).filter(models.User.id == user_id).first()
+            user = load_user_snapshot(user_id)
         except SQLAlchemyError as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {str(e)}")
 
@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import RECIPE_CACHE_MAX_ENTRIES, RECIPE_CACHE_TTL_SECONDS, RECIPE_CACHE_PERSIST
+from app.database import AsyncSessionLocal
+from app.models import GeneratedRecipeCache
+
+logger = logging.getLogger(__name__)
+
+
+# Normalize an ingredient list so order, case and duplicates don't matter
+def normalize_ingredients(ingredients):
+    return sorted({item.strip().lower() for item in ingredients if item and item.strip()})
+
+
+def ingredients_cache_key(ingredients) -> str:
+    normalized = "|".join(normalize_ingredients(ingredients))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """In-process LRU cache with a size limit and per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds: float = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RecipeCache:
+    """Two-tier cache for generated recipes: in-process LRU backed by an optional DB table."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persist: bool = False):
+        self.memory = TTLCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.db_hits = 0
+        self.db_errors = 0
+        self.db_purged = 0
+        self._purger = None
+
+    def start(self):
+        # Called from the lifespan hook; expired rows are only skipped by reads, so sweep them out
+        if self.persist:
+            self._purger = asyncio.create_task(self._purge_expired())
+
+    async def stop(self):
+        if self._purger is not None:
+            self._purger.cancel()
+            await asyncio.gather(self._purger, return_exceptions=True)
+            self._purger = None
+
+    async def purge(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(GeneratedRecipeCache).where(GeneratedRecipeCache.expires_at <= datetime.utcnow())
+            )
+            await db.commit()
+        self.db_purged += result.rowcount
+        return result.rowcount
+
+    async def _purge_expired(self):
+        while True:
+            await asyncio.sleep(min(self.ttl_seconds, 60))
+            try:
+                await self.purge()
+            except Exception as e:
+                logger.warning("Recipe cache purge failed: %s", e)
+
+    async def get(self, ingredients):
+        key = ingredients_cache_key(ingredients)
+        value = self.memory.get(key)
+        if value is not None or not self.persist:
+            return value
+
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(GeneratedRecipeCache).where(
+                    GeneratedRecipeCache.cache_key == key,
+                    GeneratedRecipeCache.expires_at > datetime.utcnow()
+                ))
+                row = result.scalars().first()
+            if row is None:
+                return None
+
+            value = json.loads(row.payload)
+            remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+            self.memory.set(key, value, ttl_seconds=max(remaining, 0))
+            self.db_hits += 1
+            return value
+        except SQLAlchemyError:
+            self.db_errors += 1
+            return None
+
+    async def set(self, ingredients, value):
+        key = ingredients_cache_key(ingredients)
+        self.memory.set(key, value)
+        if not self.persist:
+            return
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(GeneratedRecipeCache(
+                    cache_key=key,
+                    ingredients=json.dumps(normalize_ingredients(ingredients)),
+                    payload=json.dumps(value),
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                ))
+                await db.commit()
+        except SQLAlchemyError:
+            self.db_errors += 1
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats.update({
+            "persist": self.persist,
+            "db_hits": self.db_hits,
+            "db_errors": self.db_errors,
+            "db_purged": self.db_purged,
+        })
+        return stats
+
+
+recipe_cache = RecipeCache(
+    max_entries=RECIPE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RECIPE_CACHE_TTL_SECONDS,
+    persist=RECIPE_CACHE_PERSIST
+)
@@ -5,7 +5,126 @@ load_dotenv()  # automatically loads from .env file
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 DATABASE_URL = os.getenv("DATABASE_URL")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+
+# Logging for the app.* loggers; uvicorn only configures its own
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Recipe generation cache
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv("RECIPE_CACHE_MAX_ENTRIES", "1024"))
+RECIPE_CACHE_TTL_SECONDS = int(os.getenv("RECIPE_CACHE_TTL_SECONDS", "3600"))
+RECIPE_CACHE_PERSIST = os.getenv("RECIPE_CACHE_PERSIST", "false").lower() == "true"
+
+# Gemini client
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_CALL_TIMEOUT_SECONDS = float(os.getenv("GEMINI_CALL_TIMEOUT_SECONDS", "20"))
+GEMINI_TOTAL_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TOTAL_TIMEOUT_SECONDS", "45"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+GEMINI_RETRY_BASE_DELAY_SECONDS = float(os.getenv("GEMINI_RETRY_BASE_DELAY_SECONDS", "0.5"))
+# Callers allowed to queue for a slot once all are busy; beyond this requests are shed with a 503
+GEMINI_MAX_WAITING = int(os.getenv("GEMINI_MAX_WAITING", "16"))
+
+# Recipe generation output
+GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() == "true"
+RECIPES_PER_REQUEST = int(os.getenv("RECIPES_PER_REQUEST", "2"))
+GEMINI_OUTPUT_TOKENS_PER_RECIPE = int(os.getenv("GEMINI_OUTPUT_TOKENS_PER_RECIPE", "500"))
+GEMINI_OUTPUT_TOKENS_BASE = int(os.getenv("GEMINI_OUTPUT_TOKENS_BASE", "64"))
+
+# Local recipe matching
+RECIPE_MATCH_ENABLED = os.getenv("RECIPE_MATCH_ENABLED", "true").lower() == "true"
+RECIPE_MATCH_MIN_COVERAGE = float(os.getenv("RECIPE_MATCH_MIN_COVERAGE", "0.75"))
+RECIPE_MATCH_MAX_MISSING = int(os.getenv("RECIPE_MATCH_MAX_MISSING", "2"))
+RECIPE_MATCH_REFRESH_SECONDS = float(os.getenv("RECIPE_MATCH_REFRESH_SECONDS", "60"))
+# Assumed to be in every kitchen, so they never count as missing
+RECIPE_MATCH_STAPLES = [
+    item.strip() for item in
+    os.getenv("RECIPE_MATCH_STAPLES", "salt,pepper,black pepper,water,oil,cooking oil,sugar").split(",")
+    if item.strip()
+]
+
+# YouTube client
+YOUTUBE_API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+YOUTUBE_TIMEOUT_SECONDS = float(os.getenv("YOUTUBE_TIMEOUT_SECONDS", "5"))
+YOUTUBE_MAX_CONNECTIONS = int(os.getenv("YOUTUBE_MAX_CONNECTIONS", "20"))
+YOUTUBE_MAX_WAITING = int(os.getenv("YOUTUBE_MAX_WAITING", "40"))
+YOUTUBE_CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "2048"))
+YOUTUBE_CACHE_TTL_SECONDS = int(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", "86400"))
+
+# Saved recipes pagination
+SAVED_RECIPES_PAGE_SIZE = int(os.getenv("SAVED_RECIPES_PAGE_SIZE", "50"))
+SAVED_RECIPES_MAX_PAGE_SIZE = int(os.getenv("SAVED_RECIPES_MAX_PAGE_SIZE", "200"))
+
+# Saved recipe search
+# Postgres text search configuration used for stemming and stopwords
+SAVED_SEARCH_LANGUAGE = os.getenv("SAVED_SEARCH_LANGUAGE", "english")
+# Users whose in-process index is kept (non-Postgres databases only)
+SAVED_SEARCH_INDEX_MAX_USERS = int(os.getenv("SAVED_SEARCH_INDEX_MAX_USERS", "1000"))
+# How often an in-process index recounts the user's rows to catch saves committed out of id order
+SAVED_SEARCH_RECOUNT_SECONDS = float(os.getenv("SAVED_SEARCH_RECOUNT_SECONDS", "60"))
+
+# Batch saves
+SAVE_BATCH_MAX_RECIPES = int(os.getenv("SAVE_BATCH_MAX_RECIPES", "100"))
+
+# Batch generation
+GENERATE_BATCH_MAX_ITEMS = int(os.getenv("GENERATE_BATCH_MAX_ITEMS", "20"))
+GENERATE_BATCH_CONCURRENCY = int(os.getenv("GENERATE_BATCH_CONCURRENCY", "4"))
+
+# Generation jobs
+GENERATION_JOB_STORE = os.getenv("GENERATION_JOB_STORE", "memory")  # "memory" or "database"
+GENERATION_JOB_WORKERS = int(os.getenv("GENERATION_JOB_WORKERS", "4"))
+GENERATION_JOB_MAX_QUEUE = int(os.getenv("GENERATION_JOB_MAX_QUEUE", "200"))
+GENERATION_JOB_TTL_SECONDS = int(os.getenv("GENERATION_JOB_TTL_SECONDS", "3600"))
+# Long-polls must return before the load balancer's 30 s idle timeout
+GENERATION_JOB_MAX_WAIT_SECONDS = float(os.getenv("GENERATION_JOB_MAX_WAIT_SECONDS", "25"))
+GENERATION_JOB_POLL_INTERVAL_SECONDS = float(os.getenv("GENERATION_JOB_POLL_INTERVAL_SECONDS", "0.5"))
+
+# Rate limiting (token bucket per user and route group)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "database" shares buckets between workers
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Burst covers a full /generate/batch, which is charged one token per distinct pantry
+RATE_LIMIT_GENERATE_PER_MINUTE = float(os.getenv("RATE_LIMIT_GENERATE_PER_MINUTE", "20"))
+RATE_LIMIT_GENERATE_BURST = int(os.getenv("RATE_LIMIT_GENERATE_BURST", "20"))
+RATE_LIMIT_YOUTUBE_PER_MINUTE = float(os.getenv("RATE_LIMIT_YOUTUBE_PER_MINUTE", "60"))
+RATE_LIMIT_YOUTUBE_BURST = int(os.getenv("RATE_LIMIT_YOUTUBE_BURST", "20"))
+# Retry-After sent with 503s when upstream capacity is saturated
+LOAD_SHED_RETRY_AFTER_SECONDS = int(os.getenv("LOAD_SHED_RETRY_AFTER_SECONDS", "2"))
+
+# Response compression
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# Bodies at least this large are compressed off the event loop
+COMPRESSION_THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", "262144"))
+# Past these, CPU roughly doubles for a few percent fewer bytes (bench.bench_serialization)
+GZIP_COMPRESSION_LEVEL = int(os.getenv("GZIP_COMPRESSION_LEVEL", "4"))
+BROTLI_COMPRESSION_QUALITY = int(os.getenv("BROTLI_COMPRESSION_QUALITY", "4"))
+
+# Auth caches
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+# Password hashing
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# Inventory snapshot
+INVENTORY_VERSION_CHECK_SECONDS = float(os.getenv("INVENTORY_VERSION_CHECK_SECONDS", "30"))
+
+# Database pools
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")  # derived from DATABASE_URL when unset
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Startup and health checks
+CREATE_TABLES_ON_STARTUP = os.getenv("CREATE_TABLES_ON_STARTUP", "true").lower() == "true"
+# Apply app.migrations before reporting ready; turn off when a deploy step runs them instead
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() == "true"
+STARTUP_RETRY_MAX_DELAY_SECONDS = float(os.getenv("STARTUP_RETRY_MAX_DELAY_SECONDS", "30"))
+READINESS_DB_TIMEOUT_SECONDS = float(os.getenv("READINESS_DB_TIMEOUT_SECONDS", "2"))
@@ -1,11 +1,50 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_PRE_PING,
+)
+
+# Async drivers used by the request path for each sync URL scheme
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def pool_options(url: str) -> dict:
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+    }
+    # SQLite's pools don't take size/overflow limits
+    if not make_url(url).drivername.startswith("sqlite"):
+        options.update({
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        })
+    return options
+
+# Sync engine: scripts, seeding, migrations and sync (threadpool) routes
 engine = create_engine(
     DATABASE_URL,
     echo=False,  
-    future=True      # Enables SQLAlchemy 2.0 style usage
+    future=True,      # Enables SQLAlchemy 2.0 style usage
+    **pool_options(DATABASE_URL)
 )
 
 SessionLocal = sessionmaker(
@@ -15,6 +54,21 @@ SessionLocal = sessionmaker(
     expire_on_commit=False  # Prevents attributes from expiring after commit
 )
 
+# Async engine: async def routes, so DB waits never block the event loop
+async_database_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(
+    async_database_url,
+    echo=False,
+    **pool_options(async_database_url)
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -25,3 +79,7 @@ def get_db():
         raise e
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from app.metrics import Counter, Histogram, observe_upstream, registry
+from app.config import (
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_CALL_TIMEOUT_SECONDS,
+    GEMINI_TOTAL_TIMEOUT_SECONDS,
+    GEMINI_MAX_RETRIES,
+    GEMINI_RETRY_BASE_DELAY_SECONDS,
+    GEMINI_MAX_WAITING,
+)
+
+logger = logging.getLogger(__name__)
+
+gemini_tokens = registry.register(Counter(
+    "gemini_tokens_total", "Gemini tokens billed", labelnames=("kind",)
+))
+gemini_tokens_per_call = registry.register(Histogram(
+    "gemini_tokens_per_call", "Gemini tokens per call", labelnames=("kind",),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192)
+))
+
+
+# Set by callers that are already queued work (generation jobs), so they wait for a slot instead of being shed
+wait_for_slot: ContextVar = ContextVar("gemini_wait_for_slot", default=False)
+
+
+@lru_cache(maxsize=None)
+def transient_errors() -> tuple:
+    # Upstream errors worth retrying; everything else fails fast.
+    # google.api_core pulls in grpc, so it is imported on the first failure rather than at startup.
+    from google.api_core import exceptions as google_exceptions
+
+    return (
+        asyncio.TimeoutError,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.TooManyRequests,
+    )
+
+
+def record_usage(response, operation: str):
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    counts = {
+        "prompt": getattr(usage, "prompt_token_count", 0) or 0,
+        "output": getattr(usage, "candidates_token_count", 0) or 0,
+    }
+    for kind, count in counts.items():
+        gemini_tokens.inc(count, kind=kind)
+        gemini_tokens_per_call.observe(count, kind=kind)
+    logger.info(
+        "Gemini %s tokens: prompt=%d output=%d total=%d",
+        operation, counts["prompt"], counts["output"], counts["prompt"] + counts["output"]
+    )
+
+
+class GeminiError(Exception):
+    pass
+
+
+class GeminiTimeoutError(GeminiError):
+    pass
+
+
+class GeminiUnavailableError(GeminiError):
+    pass
+
+
+class GeminiOverloadedError(GeminiUnavailableError):
+    """Every slot is busy and the wait line is full; raised at once instead of queueing."""
+
+
+class GeminiClient:
+    """Non-blocking Gemini wrapper with bounded concurrency, deadlines and retries."""
+
+    def __init__(
+        self,
+        model=None,
+        max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+        call_timeout: float = GEMINI_CALL_TIMEOUT_SECONDS,
+        total_timeout: float = GEMINI_TOTAL_TIMEOUT_SECONDS,
+        max_retries: int = GEMINI_MAX_RETRIES,
+        retry_base_delay: float = GEMINI_RETRY_BASE_DELAY_SECONDS,
+        max_waiting: int = GEMINI_MAX_WAITING,
+    ):
+        self._model = model
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.in_use = 0
+        self.waiting = 0
+        self.shed = 0
+        self.call_timeout = call_timeout
+        self.total_timeout = total_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+    def _get_model(self):
+        if self._model is None:
+            # The SDK takes about a second to import, so it is loaded with the first request
+            import google.generativeai as genai
+
+            genai.configure(api_key=GEMINI_API_KEY)
+            self._model = genai.GenerativeModel(GEMINI_MODEL)
+        return self._model
+
+    def warm(self):
+        # Import and configure the SDK ahead of the first request
+        self._get_model()
+        transient_errors()
+
+    def saturated(self) -> bool:
+        # Counted by hand: the semaphore only looks taken once a waiter's acquire has actually run
+        return self.in_use + self.waiting >= self.max_concurrency + self.max_waiting
+
+    async def _acquire_slot(self, timeout: float):
+        # Load shedding: when upstream is saturated, a fast 503 beats a long wait ending in a timeout
+        if self.saturated() and not wait_for_slot.get():
+            self.shed += 1
+            raise GeminiOverloadedError("Gemini is at capacity")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise GeminiTimeoutError("Timed out waiting for a free Gemini slot")
+        finally:
+            self.waiting -= 1
+        self.in_use += 1
+
+    def _release_slot(self):
+        self.in_use -= 1
+        self._semaphore.release()
+
+    async def _call_once(self, prompt, generation_config, timeout: float):
+        model = self._get_model()
+        if hasattr(model, "generate_content_async"):
+            call = model.generate_content_async(prompt, generation_config=generation_config)
+        else:
+            # Fall back to a worker thread so a sync client never blocks the event loop
+            call = asyncio.to_thread(model.generate_content, prompt, generation_config=generation_config)
+        with observe_upstream("gemini"):
+            return await asyncio.wait_for(call, timeout=timeout)
+
+    async def generate_text(self, prompt: str, generation_config: dict = None) -> str:
+        deadline = time.monotonic() + self.total_timeout
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise GeminiTimeoutError("Gemini request exceeded its overall deadline")
+
+            await self._acquire_slot(remaining)
+            try:
+                timeout = min(self.call_timeout, deadline - time.monotonic())
+                response = await self._call_once(prompt, generation_config, timeout)
+                record_usage(response, "generate")
+                return response.text
+            except transient_errors() as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise GeminiTimeoutError("Gemini request timed out")
+                    raise GeminiUnavailableError(f"Gemini unavailable: {str(e)}")
+            finally:
+                self._release_slot()
+
+            # Exponential backoff with full jitter, never sleeping past the deadline
+            delay = random.uniform(0, self.retry_base_delay * (2 ** (attempt - 1)))
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+
+    async def stream_text(self, prompt: str, generation_config: dict = None):
+        # Streams can't be replayed once chunks reach the client, so there are no retries here
+        deadline = time.monotonic() + self.total_timeout
+        await self._acquire_slot(self.total_timeout)
+
+        try:
+            with observe_upstream("gemini_stream"):
+                model = self._get_model()
+                response = await asyncio.wait_for(
+                    model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                    timeout=self.call_timeout
+                )
+                chunks = response.__aiter__()
+                chunk = None
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise GeminiTimeoutError("Gemini stream exceeded its overall deadline")
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=min(self.call_timeout, remaining))
+                    except StopAsyncIteration:
+                        break
+                    yield chunk.text
+                # Usage totals arrive with the final chunk
+                record_usage(chunk, "stream")
+        except asyncio.TimeoutError:
+            raise GeminiTimeoutError("Gemini stream timed out")
+        except transient_errors() as e:
+            raise GeminiUnavailableError(f"Gemini unavailable: {str(e)}")
+        finally:
+            self._release_slot()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "shed": self.shed,
+        }
+
+gemini_client = GeminiClient()
@@ -0,0 +1,154 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from app.inventory_snapshot import inventory_snapshot
+
+MIN_TRIGRAM_SIMILARITY = 0.4
+# Typo-corrected matches rank below exact prefix matches
+CORRECTED_MATCH_PENALTY = 0.5
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InventorySearchIndex:
+    """Autocomplete index over inventory names: prefix matching plus trigram typo tolerance.
+
+    The prefix side is a flattened trie: every name and every word-suffix of a
+    name is kept in one sorted array, so all keys under a prefix form a
+    contiguous range found with bisect. Typos are handled by snapping unknown
+    query words to the closest vocabulary word by trigram similarity, then
+    re-running the prefix lookup.
+    """
+
+    def __init__(self, items: list):
+        self.items = items
+        self.names = [normalize_text(item["name"]) for item in items]
+
+        keys = []
+        vocabulary = set()
+        for idx, name in enumerate(self.names):
+            words = name.split()
+            vocabulary.update(words)
+            for pos in range(len(words)):
+                keys.append((" ".join(words[pos:]), idx))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_items = [idx for _, idx in keys]
+
+        self._vocabulary = sorted(vocabulary)
+        self._word_grams = [trigrams(word) for word in self._vocabulary]
+        postings = defaultdict(list)
+        for word_idx, grams in enumerate(self._word_grams):
+            for gram in grams:
+                postings[gram].append(word_idx)
+        self._postings = dict(postings)
+
+    def _prefix_matches(self, query: str, limit: int, penalty: float = 0.0) -> dict:
+        scores = {}
+        start = bisect_left(self._keys, query)
+        for pos in range(start, len(self._keys)):
+            key = self._keys[pos]
+            if not key.startswith(query):
+                break
+            idx = self._key_items[pos]
+            name = self.names[idx]
+            if name == query:
+                score = 3.0
+            elif name.startswith(query):
+                score = 2.0
+            else:
+                score = 1.0
+            # Shorter names are closer completions of the same prefix
+            score += 1.0 / (1 + len(name)) - penalty
+            if score > scores.get(idx, 0):
+                scores[idx] = score
+            if len(scores) >= limit * 4:
+                break
+        return scores
+
+    def _is_known_prefix(self, word: str) -> bool:
+        pos = bisect_left(self._vocabulary, word)
+        return pos < len(self._vocabulary) and self._vocabulary[pos].startswith(word)
+
+    def _closest_word(self, word: str):
+        grams = trigrams(word)
+        shared = defaultdict(int)
+        for gram in grams:
+            for word_idx in self._postings.get(gram, ()):
+                shared[word_idx] += 1
+
+        best, best_similarity = None, MIN_TRIGRAM_SIMILARITY
+        for word_idx, count in shared.items():
+            similarity = count / (len(grams) + len(self._word_grams[word_idx]) - count)
+            if similarity > best_similarity:
+                best, best_similarity = self._vocabulary[word_idx], similarity
+        return best
+
+    def _corrected_query(self, query: str):
+        words = query.split()
+        corrected = []
+        for word in words:
+            if self._is_known_prefix(word):
+                corrected.append(word)
+                continue
+            replacement = self._closest_word(word)
+            if replacement is None:
+                return None
+            corrected.append(replacement)
+        corrected = " ".join(corrected)
+        return corrected if corrected != query else None
+
+    def search(self, query: str, limit: int = 10) -> list:
+        query = normalize_text(query)
+        if not query or not self.items:
+            return []
+
+        scores = self._prefix_matches(query, limit)
+        if len(scores) < limit:
+            corrected = self._corrected_query(query)
+            if corrected:
+                for idx, score in self._prefix_matches(corrected, limit, CORRECTED_MATCH_PENALTY).items():
+                    if idx not in scores:
+                        scores[idx] = score
+
+        ranked = sorted(scores.items(), key=lambda pair: (-pair[1], self.names[pair[0]]))[:limit]
+        return [{**self.items[idx], "score": round(score, 3)} for idx, score in ranked]
+
+
+def build_search_index(grouped: dict) -> InventorySearchIndex:
+    items = [
+        {"id": item["id"], "name": item["name"], "category": category, "unit": item["unit"]}
+        for category, category_items in grouped.items()
+        for item in category_items
+    ]
+    return InventorySearchIndex(items)
+
+
+class InventorySearchStore:
+    """Keeps the search index in step with the inventory snapshot it was built from."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self) -> InventorySearchIndex:
+        snapshot = inventory_snapshot.get()
+        if snapshot is self._snapshot:
+            return self._index
+
+        with self._lock:
+            if snapshot is not self._snapshot:
+                self._index = build_search_index(snapshot.grouped)
+                self._snapshot = snapshot
+            return self._index
+
+
+inventory_search = InventorySearchStore()
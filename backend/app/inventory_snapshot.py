@@ -0,0 +1,102 @@
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from app.compression import compress, supported_encodings
+from app.config import INVENTORY_VERSION_CHECK_SECONDS
+from app.database import SessionLocal
+from app.models import CatalogVersion, Inventory
+
+INVENTORY_CATALOG = "inventory"
+
+
+@dataclass(frozen=True)
+class InventorySnapshot:
+    version: int
+    grouped: dict
+    body: bytes
+    etag: str
+    # Content-Encoding -> body, compressed once per version instead of per request
+    encoded_bodies: dict
+
+
+def read_inventory_version(db: Session) -> int:
+    marker = db.get(CatalogVersion, INVENTORY_CATALOG)
+    return marker.version if marker else 0
+
+
+def bump_inventory_version(db: Session):
+    # Call inside the writer's transaction, before commit
+    marker = db.get(CatalogVersion, INVENTORY_CATALOG)
+    if marker is None:
+        db.add(CatalogVersion(name=INVENTORY_CATALOG, version=1))
+    else:
+        marker.version = CatalogVersion.version + 1
+    inventory_snapshot.invalidate()
+
+
+def build_inventory_snapshot(db: Session, version: int) -> InventorySnapshot:
+    grouped = defaultdict(list)
+    for item in db.query(Inventory).order_by(Inventory.id).all():
+        grouped[item.category].append({
+            "id": item.id,
+            "name": item.name,
+            "description": item.description,
+            "image_url": item.image_url,
+            "unit": item.unit
+        })
+
+    grouped = dict(grouped)
+    body = json.dumps(grouped, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    encoded_bodies = {encoding: compress(body, encoding) for encoding in supported_encodings()}
+    return InventorySnapshot(version=version, grouped=grouped, body=body, etag=etag, encoded_bodies=encoded_bodies)
+
+
+class InventorySnapshotStore:
+    """Immutable grouped-inventory snapshot, rebuilt only when the catalog version moves.
+
+    The version marker is re-read at most every check_interval seconds, so the
+    common request path touches neither the database nor the serializer.
+    """
+
+    def __init__(self, check_interval: float = INVENTORY_VERSION_CHECK_SECONDS):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def get(self) -> InventorySnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return snapshot
+
+            db = SessionLocal()
+            try:
+                version = read_inventory_version(db)
+                if snapshot is None or snapshot.version != version:
+                    snapshot = build_inventory_snapshot(db, version)
+                    self.rebuilds += 1
+            finally:
+                db.close()
+
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    def invalidate(self):
+        # Forces a version check (and rebuild if needed) on the next request
+        self._checked_at = 0.0
+        self._snapshot = None
+
+
+inventory_snapshot = InventorySnapshotStore()
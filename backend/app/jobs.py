@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from app.database import AsyncSessionLocal
+from app.metrics import Histogram, registry, LATENCY_BUCKETS, UPSTREAM_BUCKETS
+from app.models import GenerationJob
+from app.recipe_stream import validate_recipes
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+job_wait_seconds = registry.register(Histogram(
+    "generation_job_wait_seconds", "Time generation jobs spend queued before a worker starts them",
+    buckets=LATENCY_BUCKETS + (60.0, 120.0)
+))
+job_run_seconds = registry.register(Histogram(
+    "generation_job_run_seconds", "Time workers spend running a generation job",
+    labelnames=("status",), buckets=UPSTREAM_BUCKETS
+))
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def checked_outcome(outcome: dict) -> dict:
+    # A job stored as succeeded is rendered as GenerationJobOut on every poll until it
+    # expires, so recipes that don't fit the schema fail the job now instead
+    if outcome.get("status_code") != 200:
+        return outcome
+    recipes, rejected = validate_recipes(outcome.get("recipes"))
+    if rejected:
+        return {"status_code": 502, "error": f"Recipe generation returned invalid recipes ({rejected} rejected)"}
+    return {**outcome, "recipes": recipes}
+
+
+class MemoryJobStore:
+    """Jobs kept in this process. Only valid with one app worker (or sticky routing)."""
+    name = "memory"
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    async def create(self, job: GenerationJob):
+        with self._lock:
+            self._jobs[job.id] = job
+
+    async def update(self, job: GenerationJob):
+        # Workers mutate the stored object in place
+        with self._lock:
+            self._jobs[job.id] = job
+
+    async def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.expires_at <= datetime.utcnow():
+                del self._jobs[job_id]
+                return None
+            return job
+
+    async def purge(self) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.expires_at <= now]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class DatabaseJobStore:
+    """Jobs in the generation_jobs table, so any app worker can answer a poll."""
+    name = "database"
+
+    async def create(self, job: GenerationJob):
+        async with AsyncSessionLocal() as db:
+            db.add(job)
+            await db.commit()
+
+    async def update(self, job: GenerationJob):
+        async with AsyncSessionLocal() as db:
+            await db.merge(job)
+            await db.commit()
+
+    async def get(self, job_id: str):
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(GenerationJob).where(
+                GenerationJob.id == job_id,
+                GenerationJob.expires_at > datetime.utcnow()
+            ))
+            return result.scalars().first()
+
+    async def purge(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(delete(GenerationJob).where(GenerationJob.expires_at <= datetime.utcnow()))
+            await db.commit()
+            return result.rowcount
+
+
+JOB_STORES = {
+    "memory": MemoryJobStore,
+    "database": DatabaseJobStore,
+}
+
+
+def make_job_store(name: str):
+    if name not in JOB_STORES:
+        raise ValueError(f"Unknown job store {name!r}, expected one of {', '.join(JOB_STORES)}")
+    return JOB_STORES[name]()
+
+
+class GenerationQueue:
+    """Bounded queue of generation jobs drained by a fixed pool of asyncio workers.
+
+    submit() records the job and returns at once; a worker later calls
+    runner(ingredients), which returns a dict with status_code and either
+    source/recipes or error, and stores the outcome. Jobs run in the process
+    that accepted them, while the store decides who can see them: polls for a
+    job queued here wake as soon as it finishes, others re-read the store.
+    Jobs still queued when the process stops are lost and simply expire.
+    """
+
+    def __init__(self, runner, store, workers: int, max_queue: int, ttl_seconds: int, poll_interval: float):
+        self.runner = runner
+        self.store = store
+        self.workers = workers
+        self.max_queue = max_queue
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval = poll_interval
+        self._queue = None
+        self._tasks = []
+        self._finished_events = {}
+        self.running = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        # Called from the lifespan hook, so the queue belongs to the serving event loop
+        self._queue = asyncio.Queue(self.max_queue)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge_expired()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, user_id: int, ingredients: list) -> GenerationJob:
+        if self._queue is None or self._queue.full():
+            self.rejected += 1
+            raise JobQueueFull("Generation queue is full, try again shortly")
+
+        now = datetime.utcnow()
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=QUEUED,
+            ingredients=list(ingredients),
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        await self.store.create(job)
+        try:
+            self._queue.put_nowait((job, time.monotonic()))
+        except asyncio.QueueFull:
+            # Filled up while the job was being stored
+            self.rejected += 1
+            await self._finish(job, {"status_code": 503, "error": "Generation queue is full, try again shortly"})
+            raise JobQueueFull("Generation queue is full, try again shortly")
+        self._finished_events[job.id] = asyncio.Event()
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str):
+        return await self.store.get(job_id)
+
+    async def wait(self, job: GenerationJob, timeout: float):
+        """Long-poll: return the job once it has finished, or as it is after timeout seconds."""
+        if job.status in FINISHED or timeout <= 0:
+            return job
+
+        event = self._finished_events.get(job.id)
+        if event is not None:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(event.wait(), timeout)
+            return await self.store.get(job.id)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            await asyncio.sleep(min(self.poll_interval, remaining))
+            job = await self.store.get(job.id)
+            if job is None or job.status in FINISHED:
+                return job
+
+    async def _work(self):
+        while True:
+            job, queued_at = await self._queue.get()
+            try:
+                await self._run(job, queued_at)
+            except Exception as e:
+                logger.warning("Generation job %s failed to complete: %s", job.id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: GenerationJob, queued_at: float):
+        started = time.monotonic()
+        job_wait_seconds.observe(started - queued_at)
+        self.running += 1
+        try:
+            job.status = RUNNING
+            job.started_at = datetime.utcnow()
+            await self.store.update(job)
+            outcome = checked_outcome(await self.runner(job.ingredients))
+        except Exception as e:
+            outcome = {"status_code": 500, "error": f"Error generating recipes: {str(e)}"}
+        finally:
+            self.running -= 1
+        await self._finish(job, outcome)
+        job_run_seconds.observe(time.monotonic() - started, status=job.status)
+
+    async def _finish(self, job: GenerationJob, outcome: dict):
+        job.status_code = outcome["status_code"]
+        job.status = SUCCEEDED if job.status_code == 200 else FAILED
+        job.source = outcome.get("source")
+        job.recipes = outcome.get("recipes")
+        job.error = outcome.get("error")
+        job.finished_at = datetime.utcnow()
+        if job.status == SUCCEEDED:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        try:
+            await self.store.update(job)
+        finally:
+            event = self._finished_events.pop(job.id, None)
+            if event is not None:
+                event.set()
+
+    async def _purge_expired(self):
+        while True:
+            await asyncio.sleep(min(self.ttl_seconds, 60))
+            try:
+                await self.store.purge()
+            except Exception as e:
+                logger.warning("Generation job purge failed: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "store": self.store.name,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
@@ -1,27 +1,106 @@
-from fastapi import FastAPI
-from app.database import engine, Base
-from app.routes import user, inventory, recipe  
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from app.config import LOG_LEVEL
+from app.database import engine, async_engine
+from app import metrics
+from app.auth import token_cache, user_cache
+from app.cache import recipe_cache
+from app.compression import CompressionMiddleware
+from app.gemini import gemini_client
+from app.ratelimit import generate_limiter, youtube_limiter
+from app.recipe_match import recipe_matcher
+from app.saved_search import saved_recipe_search
+from app.routes import user, inventory, recipe, health
+from app.startup import prepare_app
+from app.youtube import youtube_client
+from app.utils import password_hasher
 from fastapi.middleware.cors import CORSMiddleware
 
-Base.metadata.create_all(bind=engine)
+# uvicorn leaves the root logger unconfigured, which would drop app.* records below WARNING,
+# Gemini token usage included. A root handler set up by the deployment takes precedence.
+app_logger = logging.getLogger("app")
+app_logger.setLevel(LOG_LEVEL)
+if not logging.getLogger().handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    app_logger.addHandler(handler)
 
-app = FastAPI()
+# Importing this module must stay free of I/O: schema creation and warm-up run
+# from the lifespan hook, and /health/ready reports when they have finished.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup = asyncio.create_task(prepare_app())
+    recipe.generation_queue.start()
+    recipe_cache.start()
+    yield
+    startup.cancel()
+    with suppress(asyncio.CancelledError):
+        await startup
+    await recipe.generation_queue.stop()
+    await recipe_cache.stop()
+    await youtube_client.aclose()
+    password_hasher.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],  
+    expose_headers=["X-Next-Cursor", "ETag", "X-Recipe-Source", "Location", "Retry-After"],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(user.router)
 app.include_router(inventory.router)
 app.include_router(recipe.router)
+app.include_router(health.router)
+
+# Metrics: SQL counters on both engines, pool gauges and component stats
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine.sync_engine, "async")
+metrics.register_pool_gauges(engine, "sync")
+metrics.register_pool_gauges(async_engine.sync_engine, "async")
+metrics.registry.register_stats("recipe_cache", recipe_cache.stats)
+metrics.registry.register_stats("recipe_match", recipe_matcher.stats)
+metrics.registry.register_stats("saved_search", saved_recipe_search.stats)
+metrics.registry.register_stats("recipe_generate_coalescing", recipe.generate_flight.stats)
+metrics.registry.register_stats("generation_jobs", recipe.generation_queue.stats)
+metrics.registry.register_stats("gemini_client", gemini_client.stats)
+metrics.registry.register_stats("youtube_client", youtube_client.stats)
+metrics.registry.register_stats("rate_limit_generate", generate_limiter.stats)
+metrics.registry.register_stats("rate_limit_youtube", youtube_limiter.stats)
+metrics.registry.register_stats("youtube_cache", youtube_client.cache.stats)
+metrics.registry.register_stats("youtube_coalescing", youtube_client.flight.stats)
+metrics.registry.register_stats("auth_token_cache", token_cache.stats)
+metrics.registry.register_stats("auth_user_cache", user_cache.stats)
+metrics.registry.register_stats("password_hasher", password_hasher.stats)
 
-# @app.get("/")
-# def root():
-#     return {"message": "Welcome to Recipe App API"}
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    db_stats = metrics.RequestDBStats()
+    token = metrics.request_db_stats.set(db_stats)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        metrics.http_request_duration.observe(
+            time.perf_counter() - start, method=request.method, route=route_path, status=status_code
+        )
+        metrics.db_queries_per_request.observe(db_stats.queries, route=route_path)
+        metrics.db_time_per_request.observe(db_stats.seconds, route=route_path)
+        metrics.request_db_stats.reset(token)
 
-@app.head("/")
-def health_check():
-    return {"message": "Welcome to Recipe App API"}
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,150 @@
+from sqlalchemy import inspect, text
+from app.database import Base, engine
+from app.config import SAVED_SEARCH_LANGUAGE
+from app.models import SavedRecipe, SavedRecipeVideo, SavedYouTubeVideo
+from app.saved_search import SEARCH_VECTOR_SQL
+
+# Idempotent schema upgrades for databases created before the current models.
+# Applied at startup unless RUN_MIGRATIONS_ON_STARTUP is off; run by hand with: python -m app.migrations
+
+def add_foreign_key_indexes():
+    # create_all() never adds indexes to tables that already exist
+    existing_tables = inspect(engine).get_table_names()
+    for table in (SavedRecipe.__table__, SavedRecipeVideo.__table__):
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {c["name"] for c in inspect(engine).get_columns(table.name)}
+        for index in table.indexes:
+            # Indexes on columns added by a later migration are created there
+            if not all(column.name in existing_columns for column in index.columns):
+                continue
+            index.create(bind=engine, checkfirst=True)
+
+SAVED_RECIPE_JSON_COLUMNS = ("ingredients_available", "ingredients_needed", "instructions", "nutrition")
+
+def convert_saved_recipe_json_columns():
+    # Rows written before the JSON columns hold json.dumps() text. On SQLite the
+    # JSON type is stored as that same text, so only Postgres needs converting.
+    if engine.dialect.name != "postgresql":
+        return
+    if SavedRecipe.__tablename__ not in inspect(engine).get_table_names():
+        return
+
+    columns = {c["name"]: c["type"] for c in inspect(engine).get_columns(SavedRecipe.__tablename__)}
+    with engine.begin() as conn:
+        for name in SAVED_RECIPE_JSON_COLUMNS:
+            if columns[name].__class__.__name__ == "JSONB":
+                continue
+            conn.execute(text(
+                f"ALTER TABLE {SavedRecipe.__tablename__} "
+                f"ALTER COLUMN {name} TYPE JSONB USING {name}::jsonb"
+            ))
+
+def add_saved_recipe_search_vector():
+    # Every database gets the column so the table matches the model; only Postgres
+    # fills and indexes it, other databases search saved recipes in process
+    if SavedRecipe.__tablename__ not in inspect(engine).get_table_names():
+        return
+
+    column = SavedRecipe.__table__.c.search_vector
+    existing_columns = {c["name"] for c in inspect(engine).get_columns(SavedRecipe.__tablename__)}
+    with engine.begin() as conn:
+        if column.name not in existing_columns:
+            conn.execute(text(
+                f"ALTER TABLE {SavedRecipe.__tablename__} "
+                f"ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+            ))
+        if engine.dialect.name != "postgresql":
+            return
+        conn.execute(text(
+            f"UPDATE {SavedRecipe.__tablename__} SET search_vector = {SEARCH_VECTOR_SQL} WHERE search_vector IS NULL"
+        ), {"language": SAVED_SEARCH_LANGUAGE})
+    for index in SavedRecipe.__table__.indexes:
+        if column in index.columns:
+            index.create(bind=engine, checkfirst=True)
+
+# Per-recipe video copies, replaced by youtube_videos + saved_recipe_videos
+LEGACY_VIDEO_TABLE = "recipe_youtube_videos"
+VIDEO_TEXT_COLUMNS = ("video_id", "title", "description", "thumbnail_url", "channel_title", "published_at")
+
+def byte_length(column: str) -> str:
+    if engine.dialect.name == "postgresql":
+        return f"octet_length({column})"
+    return f"length(CAST({column} AS BLOB))"
+
+def table_storage(conn, table: str, text_columns) -> tuple:
+    """(rows, bytes of text in text_columns, bytes on disk or None where the database can't say)."""
+    text_bytes = " + ".join(f"coalesce({byte_length(column)}, 0)" for column in text_columns)
+    rows, data_bytes = conn.execute(text(f"SELECT count(*), coalesce(sum({text_bytes}), 0) FROM {table}")).one()
+    disk_bytes = None
+    if engine.dialect.name == "postgresql":
+        # Heap, TOAST and indexes
+        disk_bytes = conn.scalar(text("SELECT pg_total_relation_size(CAST(:table AS regclass))"), {"table": table})
+    return rows, int(data_bytes), disk_bytes
+
+def collapse_duplicate_youtube_videos():
+    # Each distinct video is kept once (its first saved details, as saves keep the first copy
+    # of a shared video) and every recipe that had a copy gets a link row instead, in the
+    # order the copies were saved
+    if LEGACY_VIDEO_TABLE not in inspect(engine).get_table_names():
+        return
+    Base.metadata.create_all(bind=engine, tables=[SavedYouTubeVideo.__table__, SavedRecipeVideo.__table__])
+
+    columns = ", ".join(VIDEO_TEXT_COLUMNS)
+    with engine.begin() as conn:
+        before = table_storage(conn, LEGACY_VIDEO_TABLE, VIDEO_TEXT_COLUMNS)
+        conn.execute(text(
+            f"INSERT INTO {SavedYouTubeVideo.__tablename__} ({columns}) "
+            f"SELECT {columns} FROM {LEGACY_VIDEO_TABLE} WHERE id IN ("
+            f"SELECT min(id) FROM {LEGACY_VIDEO_TABLE} "
+            f"WHERE video_id IS NOT NULL AND recipe_id IN (SELECT id FROM {SavedRecipe.__tablename__}) "
+            f"GROUP BY video_id"
+            f") ON CONFLICT (video_id) DO NOTHING"
+        ))
+        conn.execute(text(
+            f"INSERT INTO {SavedRecipeVideo.__tablename__} (recipe_id, video_id, position) "
+            f"SELECT recipe_id, video_id, row_number() OVER (PARTITION BY recipe_id ORDER BY min(id)) - 1 "
+            f"FROM {LEGACY_VIDEO_TABLE} "
+            f"WHERE video_id IS NOT NULL AND recipe_id IN (SELECT id FROM {SavedRecipe.__tablename__}) "
+            f"GROUP BY recipe_id, video_id "
+            f"ON CONFLICT (recipe_id, video_id) DO NOTHING"
+        ))
+        conn.execute(text(f"DROP TABLE {LEGACY_VIDEO_TABLE}"))
+
+    with engine.connect() as conn:
+        videos = table_storage(conn, SavedYouTubeVideo.__tablename__, VIDEO_TEXT_COLUMNS)
+        links = table_storage(conn, SavedRecipeVideo.__tablename__, ("video_id",))
+    print(storage_report(before, videos, links))
+
+def storage_report(before: tuple, videos: tuple, links: tuple) -> str:
+    lines = [
+        f"YouTube video storage: {before[0]} per-recipe copies -> {videos[0]} videos + {links[0]} links",
+        f"  text data: {before[1]:,} -> {videos[1] + links[1]:,} bytes "
+        f"(reclaimed {before[1] - videos[1] - links[1]:,})",
+    ]
+    if before[2] is not None:
+        after = videos[2] + links[2]
+        lines.append(f"  on disk incl. indexes: {before[2]:,} -> {after:,} bytes (reclaimed {before[2] - after:,})")
+    else:
+        lines.append("  SQLite keeps freed pages in the file until VACUUM is run")
+    return "\n".join(lines)
+
+MIGRATIONS = [
+    add_foreign_key_indexes,
+    convert_saved_recipe_json_columns,
+    add_saved_recipe_search_vector,
+    collapse_duplicate_youtube_videos,
+]
+
+def apply_migrations():
+    # Also run by every worker at startup (see app.startup.prepare_database)
+    for migration in MIGRATIONS:
+        migration()
+
+def run_migrations():
+    for migration in MIGRATIONS:
+        migration()
+        print(f"Applied {migration.__name__} ✅")
+
+if __name__ == "__main__":
+    run_migrations()
@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, JSON, Float, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from app.database import Base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+
+# Native JSONB on Postgres, JSON (stored as text) everywhere else
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+# Full-text search document on Postgres; unused (NULL) elsewhere, where search runs in process
+SearchVectorType = Text().with_variant(TSVECTOR(), "postgresql")
 
 class User(Base):
     __tablename__ = "users"
@@ -24,36 +30,88 @@ class Inventory(Base):
     description = Column(String, nullable=True)
     unit = Column(String, nullable=True)
 
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    # Bumped by every writer of a catalog table so in-process snapshots can tell they are stale
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
 class SavedRecipe(Base):
     __tablename__ = "saved_recipes"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     name = Column(String)
-    ingredients_available = Column(Text) 
-    ingredients_needed = Column(Text)     
-    instructions = Column(Text)         
+    ingredients_available = Column(JSONType)
+    ingredients_needed = Column(JSONType)
+    instructions = Column(JSONType)
     prep_time = Column(String)
     cook_time = Column(String)
     total_time = Column(String)
     servings = Column(Integer)
-    nutrition = Column(Text)            
+    nutrition = Column(JSONType)
+    # Written with the recipe on save; deferred so listing recipes never loads it
+    search_vector = deferred(Column(SearchVectorType, nullable=True))
     
     user = relationship("User", back_populates="saved_recipes")
-    youtube_videos = relationship("RecipeYouTubeVideo", back_populates="recipe")
+    # Read-only: saves write link rows in bulk (see routes.recipe.add_saved_recipes)
+    youtube_videos = relationship(
+        "SavedYouTubeVideo", secondary="saved_recipe_videos", order_by="SavedRecipeVideo.position", viewonly=True
+    )
 
-class RecipeYouTubeVideo(Base):
-    __tablename__ = "recipe_youtube_videos"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    recipe_id = Column(Integer, ForeignKey("saved_recipes.id"))
-    video_id = Column(String)
+    __table_args__ = (
+        Index("ix_saved_recipes_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+class SavedYouTubeVideo(Base):
+    __tablename__ = "youtube_videos"
+
+    # One row per video, however many saved recipes link to it
+    video_id = Column(String, primary_key=True)
     title = Column(String)
     description = Column(Text)
     thumbnail_url = Column(String)
     channel_title = Column(String)
     published_at = Column(String)
-    
-    recipe = relationship("SavedRecipe", back_populates="youtube_videos")
+
+class SavedRecipeVideo(Base):
+    __tablename__ = "saved_recipe_videos"
+
+    recipe_id = Column(Integer, ForeignKey("saved_recipes.id"), primary_key=True)
+    video_id = Column(String, ForeignKey("youtube_videos.video_id"), primary_key=True, index=True)
+    # Order the videos were saved in for this recipe
+    position = Column(Integer, nullable=False, default=0)
+
+class GeneratedRecipeCache(Base):
+    __tablename__ = "generated_recipe_cache"
+
+    cache_key = Column(String, primary_key=True)
+    ingredients = Column(Text)
+    payload = Column(Text)
+    expires_at = Column(DateTime, index=True)
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String(16), nullable=False)
+    ingredients = Column(JSONType)
+    status_code = Column(Integer)
+    source = Column(String(16))
+    recipes = Column(JSONType)
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    expires_at = Column(DateTime, index=True)
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    # "<route group>:<user id>" -> time (epoch seconds) at which the bucket is full again
+    key = Column(String(128), primary_key=True)
+    tat = Column(Float, nullable=False)
 
 User.saved_recipes = relationship("SavedRecipe", back_populates="user")
\ No newline at end of file
@@ -0,0 +1,165 @@
+import logging
+import math
+import time
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from app.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_GENERATE_PER_MINUTE,
+    RATE_LIMIT_GENERATE_BURST,
+    RATE_LIMIT_YOUTUBE_PER_MINUTE,
+    RATE_LIMIT_YOUTUBE_BURST,
+)
+from app.database import async_engine
+from app.models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# How often the database backend drops rows whose buckets have refilled
+DATABASE_PURGE_INTERVAL_SECONDS = 60
+
+
+class MemoryRateLimitBackend:
+    """Buckets for this worker process only; each app worker enforces its own limits."""
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats = {}
+
+    async def acquire(self, key: str, cost: float, window: float) -> float:
+        # Only ever called from the event loop, so no lock is needed
+        now = time.monotonic()
+        tat = self._tats.get(key, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + cost
+        if new_tat - now > window:
+            return new_tat - now - window
+        if len(self._tats) >= self.max_keys and key not in self._tats:
+            self._purge(now)
+        self._tats[key] = new_tat
+        return 0.0
+
+    def _purge(self, now: float):
+        # A bucket whose arrival time has passed is full, exactly as if it had never been seen
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+
+
+class DatabaseRateLimitBackend:
+    """Buckets in the rate_limit_buckets table, shared by every app worker.
+
+    An allowed request is a single upsert; the row only changes (and only comes
+    back from RETURNING) when the request fits in the bucket.
+    """
+    name = "database"
+
+    ACQUIRE = text(
+        f"INSERT INTO {RateLimitBucket.__tablename__} (key, tat) VALUES (:key, :now + :cost) "
+        f"ON CONFLICT (key) DO UPDATE SET "
+        f"tat = CASE WHEN {RateLimitBucket.__tablename__}.tat > :now THEN {RateLimitBucket.__tablename__}.tat ELSE :now END + :cost "
+        f"WHERE CASE WHEN {RateLimitBucket.__tablename__}.tat > :now THEN {RateLimitBucket.__tablename__}.tat ELSE :now END + :cost - :now <= :window "
+        f"RETURNING tat"
+    )
+    CURRENT = text(f"SELECT tat FROM {RateLimitBucket.__tablename__} WHERE key = :key")
+    PURGE = text(f"DELETE FROM {RateLimitBucket.__tablename__} WHERE tat < :now")
+
+    def __init__(self):
+        self._purged_at = 0.0
+
+    async def acquire(self, key: str, cost: float, window: float) -> float:
+        # Wall clock, since the stored times are compared across processes
+        now = time.time()
+        async with async_engine.begin() as conn:
+            if await conn.scalar(self.ACQUIRE, {"key": key, "now": now, "cost": cost, "window": window}) is not None:
+                allowed = True
+            else:
+                allowed = False
+                tat = await conn.scalar(self.CURRENT, {"key": key})
+            if now - self._purged_at > DATABASE_PURGE_INTERVAL_SECONDS:
+                self._purged_at = now
+                await conn.execute(self.PURGE, {"now": now})
+        if allowed:
+            return 0.0
+        return max(tat, now) + cost - now - window
+
+
+def make_rate_limit_backend(name: str, max_keys: int):
+    if name == "memory":
+        return MemoryRateLimitBackend(max_keys)
+    if name == "database":
+        return DatabaseRateLimitBackend()
+    raise ValueError(f"Unknown rate limit backend {name!r}, expected 'memory' or 'database'")
+
+
+class RateLimiter:
+    """Token bucket per user for one group of routes: burst requests at once, refilled at per_minute.
+
+    Stored in GCRA form, a single "next free" timestamp per bucket, so a check
+    is a dict lookup and two additions. Routes call enforce() first thing,
+    with a cost for requests that fan out; it is a plain call rather than a
+    dependency so it adds nothing to FastAPI's per-request dependency solving.
+    If the backend fails, requests are let through rather than turned into errors.
+    """
+
+    def __init__(self, name: str, per_minute: float, burst: int, backend, enabled: bool = True):
+        self.name = name
+        self.per_minute = per_minute
+        self.burst = burst
+        self.interval = 60.0 / per_minute
+        self.window = burst * self.interval
+        self.backend = backend
+        self.enabled = enabled
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    async def acquire(self, user_id: int, cost: int = 1) -> float:
+        """Take cost tokens; returns 0 when allowed, else seconds until they would be available."""
+        # A request larger than the whole bucket is charged a full bucket
+        cost = min(cost, self.burst)
+        try:
+            retry_after = await self.backend.acquire(f"{self.name}:{user_id}", cost * self.interval, self.window)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Rate limit backend failed, allowing request: %s", e)
+            return 0.0
+        if retry_after > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    async def enforce(self, user_id: int, cost: int = 1):
+        if not self.enabled:
+            return
+        retry_after = await self.acquire(user_id, cost)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many {self.name} requests, try again in {math.ceil(retry_after)}s",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "per_minute": self.per_minute,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "errors": self.errors,
+        }
+
+
+rate_limit_backend = make_rate_limit_backend(RATE_LIMIT_BACKEND, RATE_LIMIT_MAX_KEYS)
+# Routes that spend Gemini or YouTube quota, limited per user
+generate_limiter = RateLimiter(
+    "generate", RATE_LIMIT_GENERATE_PER_MINUTE, RATE_LIMIT_GENERATE_BURST, rate_limit_backend, RATE_LIMIT_ENABLED
+)
+youtube_limiter = RateLimiter(
+    "youtube", RATE_LIMIT_YOUTUBE_PER_MINUTE, RATE_LIMIT_YOUTUBE_BURST, rate_limit_backend, RATE_LIMIT_ENABLED
+)
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from array import array
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import (
+    RECIPE_MATCH_MIN_COVERAGE,
+    RECIPE_MATCH_MAX_MISSING,
+    RECIPE_MATCH_REFRESH_SECONDS,
+    RECIPE_MATCH_STAPLES,
+)
+from app.database import SessionLocal
+from app.models import SavedRecipe
+
+logger = logging.getLogger(__name__)
+
+QUANTITY = re.compile(r"^(\d+([./]\d+)?|a|an|one|two|three|half|few|some)$")
+UNITS = {
+    "cup", "cups", "tbsp", "tsp", "tablespoon", "tablespoons", "teaspoon", "teaspoons",
+    "g", "kg", "mg", "ml", "l", "oz", "lb", "lbs", "pinch", "handful", "clove", "cloves", "piece", "pieces",
+}
+# Below this share of the corpus, count matches by sorting the postings hit; above it, tally every row
+SPARSE_CANDIDATE_SHARE = 0.125
+LOAD_BATCH_SIZE = 5000
+# Refreshes re-read this many ids below the watermark, to catch saves that committed out of id order
+REFRESH_OVERLAP = 1000
+
+def singularize(word: str) -> str:
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def normalize_ingredient(text: str) -> str:
+    """'2 cups Tomatoes (diced)' -> 'tomato', so pantry items and recipe lines compare equal."""
+    # Cached: the same few thousand ingredient strings recur across the whole corpus
+    text = re.sub(r"\(.*?\)", " ", str(text).lower()).split(",")[0]
+    words = re.sub(r"[^a-z0-9./ ]", " ", text).split()
+    while words and (QUANTITY.match(words[0]) or words[0] in UNITS):
+        words.pop(0)
+    return " ".join(singularize(word) for word in words)
+
+
+STAPLES = frozenset(normalize_ingredient(item) for item in RECIPE_MATCH_STAPLES)
+
+
+class RecipeMatch:
+    __slots__ = ("recipe_id", "coverage", "matched", "missing")
+
+    def __init__(self, recipe_id: int, coverage: float, matched: int, missing: int):
+        self.recipe_id = recipe_id
+        self.coverage = coverage
+        self.matched = matched
+        self.missing = missing
+
+
+class RecipeMatchIndex:
+    """In-memory ingredient index over saved recipes.
+
+    Every distinct normalized ingredient gets a postings list: the int32 rows
+    of the recipes that use it, in insertion order. A pantry is scored by
+    concatenating the postings of its ingredients and counting how often each
+    row appears, which is how many pantry ingredients that recipe uses. Memory
+    and work grow with the ingredient lines in the corpus, not with
+    vocabulary x recipes, and adding a recipe appends to a few lists without
+    copying the rest. Staples are left out of both sides, and a recipe sharing
+    no pantry ingredient is never a match.
+    """
+
+    def __init__(self, staples=STAPLES, capacity: int = 1024):
+        self.staples = staples
+        self.vocabulary = {}
+        self.postings = []
+        self.postings_length = 0
+        self.recipe_ids = np.zeros(capacity, dtype=np.int64)
+        self.sizes = np.zeros(capacity, dtype=np.int32)
+        self.name_keys = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self._indexed_ids = set()
+        self._lock = threading.Lock()
+
+    def _ingredient_ids(self, ingredients, create: bool) -> set:
+        ids = set()
+        for item in ingredients:
+            name = normalize_ingredient(item)
+            if not name or name in self.staples:
+                continue
+            ingredient_id = self.vocabulary.get(name)
+            if ingredient_id is None:
+                if not create:
+                    continue
+                ingredient_id = self.vocabulary[name] = len(self.postings)
+                self.postings.append(array("i"))
+            ids.add(ingredient_id)
+        return ids
+
+    def _reserve(self, rows: int):
+        capacity = len(self.recipe_ids)
+        if rows > capacity:
+            capacity = max(rows, capacity * 2)
+            for field in ("recipe_ids", "sizes", "name_keys"):
+                grown = np.zeros(capacity, dtype=getattr(self, field).dtype)
+                grown[:self.count] = getattr(self, field)[:self.count]
+                setattr(self, field, grown)
+
+    def add_many(self, recipes):
+        """Index (recipe_id, name, ingredients) tuples; ids already indexed are skipped."""
+        with self._lock:
+            rows = []
+            for recipe_id, name, ingredients in recipes:
+                if recipe_id in self._indexed_ids:
+                    continue
+                self._indexed_ids.add(recipe_id)
+                rows.append((recipe_id, name, self._ingredient_ids(ingredients, create=True)))
+            if not rows:
+                return 0
+
+            self._reserve(self.count + len(rows))
+            for offset, (recipe_id, name, ingredient_ids) in enumerate(rows):
+                row = self.count + offset
+                self.recipe_ids[row] = recipe_id
+                self.sizes[row] = len(ingredient_ids)
+                self.name_keys[row] = hash((name or "").strip().lower())
+                for ingredient_id in ingredient_ids:
+                    self.postings[ingredient_id].append(row)
+                self.postings_length += len(ingredient_ids)
+            self.count += len(rows)
+            return len(rows)
+
+    def match(self, pantry, limit: int, min_coverage: float, max_missing: int) -> list:
+        with self._lock:
+            ingredient_ids = self._ingredient_ids(pantry, create=False)
+            if not ingredient_ids or not self.count:
+                return []
+
+            # A row appears once per pantry ingredient its recipe uses
+            hits = np.concatenate([np.frombuffer(self.postings[i], dtype=np.int32) for i in ingredient_ids])
+            if len(hits) < self.count * SPARSE_CANDIDATE_SHARE:
+                candidates, matched = np.unique(hits, return_counts=True)
+            else:
+                matched = np.bincount(hits, minlength=self.count)
+                candidates = np.flatnonzero(matched)
+                matched = matched[candidates]
+
+            sizes = self.sizes[candidates]
+            coverage = matched / np.maximum(sizes, 1)
+            keep = (coverage >= min_coverage) & (sizes - matched <= max_missing)
+            if not keep.any():
+                return []
+
+            candidates, matched, sizes, coverage = candidates[keep], matched[keep], sizes[keep], coverage[keep]
+            # Best coverage first, then the recipes that use the most of the pantry
+            order = np.lexsort((-matched, -coverage))
+
+            results, seen_names = [], set()
+            for pos in order:
+                row = candidates[pos]
+                name_key = int(self.name_keys[row])
+                if name_key in seen_names:
+                    continue
+                seen_names.add(name_key)
+                results.append(RecipeMatch(
+                    recipe_id=int(self.recipe_ids[row]),
+                    coverage=float(coverage[pos]),
+                    matched=int(matched[pos]),
+                    missing=int(sizes[pos] - matched[pos]),
+                ))
+                if len(results) >= limit:
+                    break
+            return results
+
+    def stats(self) -> dict:
+        return {
+            "recipes": self.count,
+            "ingredients": len(self.vocabulary),
+            "postings_bytes": self.postings_length * 4,
+        }
+
+
+class RecipeMatcher:
+    """Keeps a RecipeMatchIndex in step with saved_recipes and applies the match thresholds.
+
+    The index is loaded once in the background, appended to on every save in
+    this worker, and caught up from the database (ids above the highest one
+    read so far) every refresh_seconds to pick up saves made by other workers.
+    """
+
+    def __init__(
+        self,
+        min_coverage: float = RECIPE_MATCH_MIN_COVERAGE,
+        max_missing: int = RECIPE_MATCH_MAX_MISSING,
+        refresh_seconds: float = RECIPE_MATCH_REFRESH_SECONDS,
+    ):
+        self.index = RecipeMatchIndex()
+        self.min_coverage = min_coverage
+        self.max_missing = max_missing
+        self.refresh_seconds = refresh_seconds
+        self.loaded = False
+        self._watermark = 0
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def refresh(self) -> int:
+        # Blocking; run from a worker thread
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+        try:
+            added = 0
+            db: Session = SessionLocal()
+            try:
+                stmt = (
+                    select(SavedRecipe.id, SavedRecipe.name,
+                           SavedRecipe.ingredients_available, SavedRecipe.ingredients_needed)
+                    .where(SavedRecipe.id > max(self._watermark - REFRESH_OVERLAP, 0))
+                    .order_by(SavedRecipe.id)
+                    .execution_options(yield_per=LOAD_BATCH_SIZE)
+                )
+                for batch in db.execute(stmt).partitions():
+                    added += self.index.add_many(
+                        (row.id, row.name, (row.ingredients_available or []) + (row.ingredients_needed or []))
+                        for row in batch
+                    )
+                    self._watermark = max(self._watermark, batch[-1].id)
+            finally:
+                db.close()
+            self.loaded = True
+            self._refreshed_at = time.monotonic()
+            return added
+        finally:
+            self._refresh_lock.release()
+
+    def schedule_refresh(self):
+        # Called from request handlers: at most one background catch-up per interval
+        if time.monotonic() - self._refreshed_at < self.refresh_seconds or self._refresh_lock.locked():
+            return
+        self._refreshed_at = time.monotonic()
+        asyncio.get_running_loop().run_in_executor(None, self._refresh_quietly)
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Recipe match index refresh failed: %s", e)
+
+    def add(self, db_recipes):
+        self.index.add_many(
+            (recipe.id, recipe.name, (recipe.ingredients_available or []) + (recipe.ingredients_needed or []))
+            for recipe in db_recipes
+        )
+
+    def match(self, pantry, limit: int) -> list:
+        if not self.loaded:
+            return []
+        matches = self.index.match(pantry, limit, self.min_coverage, self.max_missing)
+        if len(matches) >= limit:
+            self.hits += 1
+            return matches
+        self.misses += 1
+        return []
+
+    def stats(self) -> dict:
+        stats = self.index.stats()
+        stats.update({"loaded": self.loaded, "hits": self.hits, "misses": self.misses})
+        return stats
+
+
+recipe_matcher = RecipeMatcher()
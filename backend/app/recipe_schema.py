@@ -0,0 +1,46 @@
+from functools import lru_cache
+from app.config import GEMINI_OUTPUT_TOKENS_BASE, GEMINI_OUTPUT_TOKENS_PER_RECIPE
+from app.schemas import RecipeResponse
+
+
+def to_gemini_schema(schema: dict, definitions: dict = None) -> dict:
+    """Convert a Pydantic JSON schema into the OpenAPI subset Gemini's response_schema accepts.
+
+    References are inlined, Optional[X] becomes plain X, and every property is
+    marked required so the model always emits the full recipe shape.
+    """
+    if definitions is None:
+        definitions = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+    if "$ref" in schema:
+        return to_gemini_schema(definitions[schema["$ref"].rsplit("/", 1)[-1]], definitions)
+
+    for combinator in ("allOf", "anyOf", "oneOf"):
+        if combinator in schema:
+            options = [option for option in schema[combinator] if option.get("type") != "null"]
+            return to_gemini_schema(options[0], definitions)
+
+    converted = {}
+    for key in ("type", "format", "description", "enum"):
+        if key in schema:
+            converted[key] = schema[key]
+    if "items" in schema:
+        converted["items"] = to_gemini_schema(schema["items"], definitions)
+    if schema.get("properties"):
+        converted["properties"] = {
+            name: to_gemini_schema(prop, definitions) for name, prop in schema["properties"].items()
+        }
+        converted["required"] = list(schema["properties"])
+    return converted
+
+
+@lru_cache(maxsize=None)
+def recipe_response_schema(recipe_count: int) -> dict:
+    # Derived once per count and shared, so treat the result as read-only
+    schema = to_gemini_schema(RecipeResponse.schema())
+    schema["properties"]["recipes"].update({"min_items": recipe_count, "max_items": recipe_count})
+    return schema
+
+
+def output_token_budget(recipe_count: int) -> int:
+    return GEMINI_OUTPUT_TOKENS_BASE + recipe_count * GEMINI_OUTPUT_TOKENS_PER_RECIPE
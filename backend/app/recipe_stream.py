@@ -0,0 +1,145 @@
+import json
+import re
+from typing import Optional
+from pydantic import ValidationError
+from app.schemas import GeneratedRecipe
+
+RECIPES_ARRAY_START = re.compile(r'"recipes"\s*:\s*\[')
+CODE_FENCE = re.compile(r'^```(?:json)?|```$', flags=re.MULTILINE)
+
+
+def strip_code_fences(text: str) -> str:
+    return CODE_FENCE.sub('', text).strip()
+
+
+class RecipeStreamParser:
+    """Incrementally pulls complete recipe objects out of a streamed Gemini response.
+
+    Text is fed in arbitrary chunks; every object inside the top-level "recipes"
+    array is returned as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self._text = []
+        self._prefix = ""
+        self._in_array = False
+        self._done = False
+        self._object = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.emitted = 0
+        self.skipped = 0
+        self._fallback_complete = False
+
+    def feed(self, chunk: str) -> list:
+        self._text.append(chunk)
+        if self._done:
+            return []
+
+        if not self._in_array:
+            self._prefix += chunk
+            match = RECIPES_ARRAY_START.search(self._prefix)
+            if not match:
+                return []
+            self._in_array = True
+            chunk = self._prefix[match.end():]
+            self._prefix = ""
+
+        recipes = []
+        for char in chunk:
+            if self._depth == 0:
+                if char == "{":
+                    self._object = [char]
+                    self._depth = 1
+                elif char == "]":
+                    self._done = True
+                    break
+                continue
+
+            self._object.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        recipes.append(json.loads("".join(self._object)))
+                    except json.JSONDecodeError:
+                        # One malformed recipe shouldn't cost the others
+                        self.skipped += 1
+                    self._object = []
+
+        self.emitted += len(recipes)
+        return recipes
+
+    def finish(self) -> list:
+        # Nothing streamed out (unexpected shape): fall back to parsing the whole body
+        if self.emitted:
+            return []
+        recipes, self._fallback_complete = parse_recipe_response("".join(self._text))
+        return recipes
+
+    @property
+    def complete(self) -> bool:
+        # True when the whole recipes array arrived intact (safe to cache)
+        if self.emitted:
+            return self._done and not self.skipped
+        return self._fallback_complete
+
+def parse_recipe_response(text: str) -> tuple:
+    """Parse a complete Gemini response into (recipes, complete).
+
+    complete is False when only part of the output could be recovered, e.g. a
+    response cut off at max_output_tokens or wrapped in stray prose; every
+    recipe object that closed cleanly is still returned. Raises ValueError when
+    nothing usable is found.
+    """
+    text = strip_code_fences(text)
+    try:
+        data = json.loads(text)
+        recipes = data if isinstance(data, list) else data.get("recipes")
+        if isinstance(recipes, list):
+            return recipes, True
+    except (json.JSONDecodeError, AttributeError):
+        pass
+
+    parser = RecipeStreamParser()
+    recipes = parser.feed(text)
+    if recipes:
+        return recipes, False
+
+    # Prose around a single JSON object
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        try:
+            data = json.loads(text[start:end + 1])
+            if isinstance(data.get("recipes"), list):
+                return data["recipes"], False
+        except json.JSONDecodeError:
+            pass
+
+    raise ValueError("No recipes found in Gemini response")
+
+
+def validate_recipe(recipe) -> Optional[dict]:
+    """The recipe as GeneratedRecipe would serialize it, or None if it doesn't fit the schema."""
+    try:
+        return GeneratedRecipe.parse_obj(recipe).dict()
+    except ValidationError:
+        return None
+
+
+def validate_recipes(recipes) -> tuple:
+    """(valid recipes, number rejected): what can be served and cached, and whether anything was dropped."""
+    valid = [recipe for recipe in map(validate_recipe, recipes or []) if recipe is not None]
+    return valid, len(recipes or []) - len(valid)
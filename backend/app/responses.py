@@ -0,0 +1,16 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Returned directly by hot routes whose content is already plain JSON-ready
+    dicts built from validated data, so FastAPI skips response_model
+    validation and jsonable_encoder for them; response_model is still declared
+    for the OpenAPI schema. Routes returning models keep FastAPI's own
+    serializer, which is faster for them than re-encoding here.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
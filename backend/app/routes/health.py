@@ -0,0 +1,38 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import text
+from app.config import READINESS_DB_TIMEOUT_SECONDS
+from app.database import async_engine
+from app.startup import startup_state
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"]
+)
+
+async def ping_database():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+@router.api_route("/live", methods=["GET", "HEAD"])
+async def liveness():
+    # The process is up and the event loop is responsive; no dependencies are checked
+    return {"status": "ok"}
+
+@router.api_route("/ready", methods=["GET", "HEAD"])
+async def readiness():
+    if not startup_state.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"status": "starting", "attempts": startup_state.attempts, "error": startup_state.last_error}
+        )
+
+    try:
+        await asyncio.wait_for(ping_database(), timeout=READINESS_DB_TIMEOUT_SECONDS)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"status": "database unavailable", "error": f"{type(e).__name__}: {e}"}
+        )
+
+    return {"status": "ready"}
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.exc import SQLAlchemyError
-from collections import defaultdict
-from app.database import get_db
-from app.models import Inventory
+from typing import List, Optional
+from app.compression import choose_encoding, weak_etag
+from app.inventory_snapshot import inventory_snapshot
+from app.inventory_search import inventory_search
 from app.auth import get_current_user  
 
 router = APIRouter(
@@ -11,31 +11,43 @@ router = APIRouter(
     tags=["inventory"]
 )
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 @router.get("/", response_model=dict)
 def get_inventory_grouped(
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user)  
 ):
     try:
-        items = db.query(Inventory).all()
+        # Served from the in-process snapshot with the JSON body already serialized
+        snapshot = inventory_snapshot.get()
 
-        if not items:
+        if not snapshot.grouped:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No inventory items found"
             )
 
-        grouped_inventory = defaultdict(list)
-        for item in items:
-            grouped_inventory[item.category].append({
-                "id": item.id,
-                "name": item.name,
-                "description": item.description,
-                "image_url": item.image_url,
-                "unit": item.unit
-            })
+        headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+        encoding = choose_encoding(accept_encoding)
+        body = snapshot.body
+        if encoding in snapshot.encoded_bodies:
+            # Pre-compressed with the snapshot; the compression middleware leaves encoded bodies alone
+            body = snapshot.encoded_bodies[encoding]
+            headers.update({"Content-Encoding": encoding, "ETag": weak_etag(snapshot.etag)})
+
+        if etag_matches(if_none_match, snapshot.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
 
-        return grouped_inventory
+    except HTTPException:
+        raise
 
     except SQLAlchemyError:
         raise HTTPException(
@@ -48,3 +60,25 @@ def get_inventory_grouped(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error: {str(e)}"
         )
+
+@router.get("/search", response_model=List[dict])
+def search_inventory(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        # In-memory prefix + trigram index, rebuilt whenever the inventory snapshot changes
+        return inventory_search.get().search(q, limit)
+
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred while searching inventory."
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {str(e)}"
+        )
@@ -1,124 +1,442 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from app.auth import get_current_user
-from app.database import get_db
-from app.config import GEMINI_API_KEY, YOUTUBE_API_KEY
-from app.models import SavedRecipe, RecipeYouTubeVideo
-from app.schemas import RecipeResponse, RecipeIngredientsRequest, YouTubeResponse, YouTubeVideo, YouTubeSearchRequest, SavedRecipeCreate, SavedRecipeOut
-import google.generativeai as genai
+from app.cache import recipe_cache, ingredients_cache_key
+from app.database import AsyncSessionLocal, async_engine, get_async_db
+from app.config import YOUTUBE_API_KEY, SAVED_RECIPES_PAGE_SIZE, SAVED_RECIPES_MAX_PAGE_SIZE, GEMINI_STRUCTURED_OUTPUT, RECIPES_PER_REQUEST, RECIPE_MATCH_ENABLED, GENERATE_BATCH_CONCURRENCY, LOAD_SHED_RETRY_AFTER_SECONDS
+from app.config import GENERATION_JOB_STORE, GENERATION_JOB_WORKERS, GENERATION_JOB_MAX_QUEUE, GENERATION_JOB_TTL_SECONDS, GENERATION_JOB_MAX_WAIT_SECONDS, GENERATION_JOB_POLL_INTERVAL_SECONDS
+from app.jobs import GenerationQueue, JobQueueFull, make_job_store
+from app.gemini import gemini_client, wait_for_slot, GeminiError, GeminiTimeoutError, GeminiUnavailableError, GeminiOverloadedError
+from app.ratelimit import generate_limiter, youtube_limiter
+from app.models import SavedRecipe, SavedRecipeVideo, SavedYouTubeVideo
+from app.recipe_match import recipe_matcher, normalize_ingredient
+from app.recipe_schema import recipe_response_schema, output_token_budget
+from app.recipe_stream import RecipeStreamParser, parse_recipe_response, validate_recipe, validate_recipes
+from app.responses import FastJSONResponse
+from app.saved_search import saved_recipe_search
+from app.singleflight import SingleFlight
+from app.youtube import youtube_client, YouTubeError, YouTubeOverloadedError
+from app.schemas import RecipeResponse, RecipeIngredientsRequest, RecipeBatchGenerateRequest, RecipeBatchResponse, GenerationJobOut, YouTubeResponse, YouTubeVideo, YouTubeSearchRequest, SavedRecipeCreate, SavedRecipeBatchCreate, SavedRecipeOut
+import asyncio
 import json
-import re
-import requests
-from sqlalchemy.orm import Session
+import logging
+from functools import lru_cache
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/recipes",
     tags=["recipes"]
 )
 
-# Initialize Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')  # Using the latest model
+def build_structured_recipe_prompt(ingredients: List[str]) -> str:
+    # The response schema carries the output shape, so the prompt only states the task
+    return (
+        f"Suggest {RECIPES_PER_REQUEST} different recipes using mainly: {', '.join(ingredients)}. "
+        "ingredients.available lists what I have; ingredients.needed lists only minimal extra pantry items. "
+        "Number the steps. Times like \"10 mins\". Nutrition per serving like \"10g\"."
+    )
+
+def build_recipe_prompt(ingredients: List[str]) -> str:
+    return f"""
+    I have these ingredients in my kitchen: {', '.join(ingredients)}.
+    Please suggest 2 different recipes I can make using primarily these ingredients.
+    You may include minimal additional common pantry items if absolutely necessary.
+    
+    For each recipe, provide:
+    - Recipe name
+    - Ingredients grouped as:
+      * available: ingredients I already have
+      * needed: minimal additional ingredients required
+    - Step-by-step instructions with step numbers
+    - Preparation time
+    - Cooking time
+    - Total time
+    - Number of servings
+    - Nutrition information:
+        * protein (g)
+        * carbs (g)
+        * fat (g)
+        * sugars (g)
+    
+    Format the response as a perfect JSON object with this exact structure:
+    {{
+        "recipes": [
+            {{
+                "name": "Recipe name",
+                "ingredients": {{
+                    "available": ["ingredient1", "ingredient2"],
+                    "needed": ["salt", "pepper"]
+                }},
+                "instructions": [
+                    {{"step": "1", "description": "Do something"}},
+                    {{"step": "2", "description": "Do something else"}}
+                ],
+                "prep_time": "10 mins",
+                "cook_time": "20 mins",
+                "total_time": "30 mins",
+                "servings": 2,
+                "nutrition": {{
+                    "protein": "10g",
+                    "carbs": "30g",
+                    "fat": "15g",
+                    "sugars": "5g"
+                }}
+            }}
+        ]
+    }}
+    
+    Important:
+    1. Return ONLY the JSON object
+    2. Don't include any additional text or markdown formatting
+    3. Ensure all fields are included for each recipe
+    4. Ingredients must be grouped under "available" and "needed"
+    """
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": 2000
+}
+
+@lru_cache(maxsize=None)
+def structured_generation_config() -> dict:
+    return {
+        "temperature": 0.7,
+        "max_output_tokens": output_token_budget(RECIPES_PER_REQUEST),
+        "response_mime_type": "application/json",
+        "response_schema": recipe_response_schema(RECIPES_PER_REQUEST),
+    }
+
+def recipe_request(ingredients: List[str]) -> tuple:
+    # Prompt and generation config for the configured output mode
+    if GEMINI_STRUCTURED_OUTPUT:
+        return build_structured_recipe_prompt(ingredients), structured_generation_config()
+    return build_recipe_prompt(ingredients), GENERATION_CONFIG
+
+# Concurrent requests for the same normalized pantry share one Gemini call
+generate_flight = SingleFlight()
+
+async def call_gemini_for_recipes(ingredients: List[str]) -> dict:
+    # Call Gemini API without blocking the event loop
+    prompt, generation_config = recipe_request(ingredients)
+    response_text = await gemini_client.generate_text(prompt, generation_config=generation_config)
+
+    # Parse the response, keeping whatever recipes survived a truncated or noisy reply
+    try:
+        recipes, complete = parse_recipe_response(response_text)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to parse Gemini response: {str(e)}"
+        )
+
+    # Valid JSON can still miss the schema ("servings": "2-3", non-object items); such
+    # recipes are dropped here so they are never served or cached
+    recipes, rejected = validate_recipes(recipes)
+    if not recipes:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Gemini returned no valid recipes ({rejected} rejected)"
+        )
+
+    recipes_data = {"recipes": recipes}
+    if complete and not rejected:
+        await recipe_cache.set(ingredients, recipes_data)
+    else:
+        # Partial results are served but not cached, so the next request tries again
+        logger.warning("Recovered %d recipes from a malformed Gemini response (%d rejected)", len(recipes), rejected)
+    return recipes_data
+
+def matched_recipe_response(db_recipe: SavedRecipe, pantry: set) -> dict:
+    # Split the saved recipe's ingredients by what this user has, not what the original saver had
+    items = (db_recipe.ingredients_available or []) + (db_recipe.ingredients_needed or [])
+    return {
+        "name": db_recipe.name,
+        "ingredients": {
+            "available": [item for item in items if normalize_ingredient(item) in pantry],
+            "needed": [item for item in items if normalize_ingredient(item) not in pantry]
+        },
+        "instructions": db_recipe.instructions,
+        "prep_time": db_recipe.prep_time,
+        "cook_time": db_recipe.cook_time,
+        "total_time": db_recipe.total_time,
+        "servings": db_recipe.servings,
+        "nutrition": db_recipe.nutrition
+    }
+
+async def match_saved_recipes(db: AsyncSession, ingredients: List[str]) -> Optional[dict]:
+    # Answer from recipes already saved by anyone when they cover this pantry well enough
+    if not RECIPE_MATCH_ENABLED:
+        return None
+    recipe_matcher.schedule_refresh()
+    matches = recipe_matcher.match(ingredients, RECIPES_PER_REQUEST)
+    if not matches:
+        return None
+
+    ids = [match.recipe_id for match in matches]
+    result = await db.execute(select(SavedRecipe).where(SavedRecipe.id.in_(ids)))
+    by_id = {db_recipe.id: db_recipe for db_recipe in result.scalars()}
+    pantry = {normalize_ingredient(item) for item in ingredients}
+    recipes = [matched_recipe_response(by_id[recipe_id], pantry) for recipe_id in ids if recipe_id in by_id]
+    return {"recipes": recipes} if len(recipes) == len(ids) else None
+
+async def lookup_recipes(db: AsyncSession, ingredients: List[str]) -> Optional[tuple]:
+    # The sources that don't need Gemini, cheapest first: cache, then saved recipes.
+    # Returns (recipes_data, source), or None when Gemini has to be asked.
+    cached = await recipe_cache.get(ingredients)
+    if cached is not None:
+        return cached, "cache"
+
+    local = await match_saved_recipes(db, ingredients)
+    if local is not None:
+        return local, "local"
+    return None
+
+async def resolve_recipes(db: AsyncSession, ingredients: List[str]) -> tuple:
+    # lookup_recipes, then one shared Gemini call per pantry. Returns (recipes_data, source).
+    found = await lookup_recipes(db, ingredients)
+    if found is not None:
+        return found
+
+    recipes_data = await generate_flight.do(
+        ingredients_cache_key(ingredients),
+        lambda: call_gemini_for_recipes(ingredients)
+    )
+    return recipes_data, "gemini"
+
+def overloaded_error(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(LOAD_SHED_RETRY_AFTER_SECONDS)}
+    )
+
+def generation_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, GeminiOverloadedError):
+        return overloaded_error(f"Recipe generation is busy, try again shortly: {str(e)}")
+    if isinstance(e, GeminiTimeoutError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Recipe generation timed out: {str(e)}"
+        )
+    if isinstance(e, GeminiUnavailableError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Recipe generation unavailable: {str(e)}"
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Error generating recipes: {str(e)}"
+    )
 
 @router.post("/generate", response_model=RecipeResponse)
 async def generate_recipes(
     request: RecipeIngredientsRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
+    await generate_limiter.enforce(current_user.id)
     try:
-        ingredients = request.ingredients
-        
-        prompt = f"""
-        I have these ingredients in my kitchen: {', '.join(ingredients)}.
-        Please suggest 2 different recipes I can make using primarily these ingredients.
-        You may include minimal additional common pantry items if absolutely necessary.
-        
-        For each recipe, provide:
-        - Recipe name
-        - Ingredients grouped as:
-          * available: ingredients I already have
-          * needed: minimal additional ingredients required
-        - Step-by-step instructions with step numbers
-        - Preparation time
-        - Cooking time
-        - Total time
-        - Number of servings
-        - Nutrition information:
-            * protein (g)
-            * carbs (g)
-            * fat (g)
-            * sugars (g)
-        
-        Format the response as a perfect JSON object with this exact structure:
-        {{
-            "recipes": [
-                {{
-                    "name": "Recipe name",
-                    "ingredients": {{
-                        "available": ["ingredient1", "ingredient2"],
-                        "needed": ["salt", "pepper"]
-                    }},
-                    "instructions": [
-                        {{"step": "1", "description": "Do something"}},
-                        {{"step": "2", "description": "Do something else"}}
-                    ],
-                    "prep_time": "10 mins",
-                    "cook_time": "20 mins",
-                    "total_time": "30 mins",
-                    "servings": 2,
-                    "nutrition": {{
-                        "protein": "10g",
-                        "carbs": "30g",
-                        "fat": "15g",
-                        "sugars": "5g"
-                    }}
-                }}
-            ]
-        }}
-        
-        Important:
-        1. Return ONLY the JSON object
-        2. Don't include any additional text or markdown formatting
-        3. Ensure all fields are included for each recipe
-        4. Ingredients must be grouped under "available" and "needed"
-        """
-        
-        # Call Gemini API
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.7,
-                "max_output_tokens": 2000
+        # Identical pantries (ignoring order/case/duplicates) share cache entries and Gemini calls
+        recipes_data, source = await resolve_recipes(db, request.ingredients)
+        response.headers["X-Recipe-Source"] = source
+        return recipes_data
+    except Exception as e:
+        raise generation_error(e)
+
+async def resolve_item(ingredients: List[str]) -> dict:
+    # One batch item or job: its own session (one AsyncSession can't run queries
+    # concurrently) and errors reported in the result instead of raised
+    try:
+        async with AsyncSessionLocal() as db:
+            recipes_data, source = await resolve_recipes(db, ingredients)
+        # Checked here so a recipe that doesn't fit RecipeBatchItem fails this item, not the whole response
+        recipes, rejected = validate_recipes(recipes_data.get("recipes", []))
+        if rejected:
+            return {
+                "status_code": status.HTTP_502_BAD_GATEWAY,
+                "error": f"Recipe generation returned invalid recipes ({rejected} rejected)"
             }
-        )
-        
-        # Extract and clean the response
-        response_text = response.text
-        
-        # Remove markdown code blocks if present
-        response_text = re.sub(r'^```json|```$', '', response_text, flags=re.MULTILINE).strip()
-        
-        # Parse the response
-        try:
-            recipes_data = json.loads(response_text)
-            return recipes_data
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to parse Gemini response: {str(e)}"
-            )
-            
+        return {"status_code": status.HTTP_200_OK, "source": source, "recipes": recipes}
     except Exception as e:
+        error = generation_error(e)
+        return {"status_code": error.status_code, "error": str(error.detail)}
+
+@router.post("/generate/batch", response_model=RecipeBatchResponse)
+async def generate_recipes_batch(
+    batch: RecipeBatchGenerateRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    # Each distinct pantry is resolved once; items that repeat it share the result
+    pantries = {}
+    for item in batch.requests:
+        pantries.setdefault(ingredients_cache_key(item.ingredients), item.ingredients)
+    # Charged like that many /generate calls
+    await generate_limiter.enforce(current_user.id, cost=len(pantries))
+
+    semaphore = asyncio.Semaphore(GENERATE_BATCH_CONCURRENCY)
+
+    async def resolve(ingredients: List[str]) -> dict:
+        async with semaphore:
+            return await resolve_item(ingredients)
+
+    keys = list(pantries)
+    outcomes = dict(zip(keys, await asyncio.gather(*(resolve(pantries[key]) for key in keys))))
+    return {
+        "results": [
+            {"index": index, **outcomes[ingredients_cache_key(item.ingredients)]}
+            for index, item in enumerate(batch.requests)
+        ]
+    }
+
+async def run_generation_job(ingredients: List[str]) -> dict:
+    # Jobs are already queued, so they wait for a Gemini slot instead of being shed
+    wait_for_slot.set(True)
+    return await resolve_item(ingredients)
+
+# Job mode: submit returns at once and a worker pool makes the Gemini calls,
+# so clients never hold a connection for the whole generation
+generation_queue = GenerationQueue(
+    run_generation_job,
+    make_job_store(GENERATION_JOB_STORE),
+    workers=GENERATION_JOB_WORKERS,
+    max_queue=GENERATION_JOB_MAX_QUEUE,
+    ttl_seconds=GENERATION_JOB_TTL_SECONDS,
+    poll_interval=GENERATION_JOB_POLL_INTERVAL_SECONDS
+)
+
+@router.post(
+    "/generate/jobs",
+    response_model=GenerationJobOut,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_generation_job(
+    request: RecipeIngredientsRequest,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+):
+    await generate_limiter.enforce(current_user.id)
+    try:
+        job = await generation_queue.submit(current_user.id, request.ingredients)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating recipes: {str(e)}"
+            detail="Database error occurred while queueing the job."
         )
+    response.headers["Location"] = f"{router.prefix}/generate/jobs/{job.id}"
+    return job
+
+@router.get("/generate/jobs/{job_id}", response_model=GenerationJobOut)
+async def get_generation_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=GENERATION_JOB_MAX_WAIT_SECONDS, description="Seconds to long-poll for the result"),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        job = await generation_queue.get(job_id)
+        if job is None or job.user_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        job = await generation_queue.wait(job, wait)
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred while fetching the job."
+        )
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+@router.post("/generate/stream")
+async def generate_recipes_stream(
+    request: RecipeIngredientsRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    await generate_limiter.enforce(current_user.id)
+    ingredients = request.ingredients
+    # Resolved before streaming starts, while the request's session is still open
+    found = await lookup_recipes(db, ingredients)
+    if found is None and gemini_client.saturated():
+        raise overloaded_error("Recipe generation is busy, try again shortly")
+
+    # NDJSON: one GeneratedRecipe per line, sent as soon as its object closes
+    def to_line(recipe: dict) -> str:
+        return json.dumps(recipe) + "\n"
+
+    async def recipe_lines():
+        if found is not None:
+            recipes_data, _ = found
+            for recipe in validate_recipes(recipes_data.get("recipes", []))[0]:
+                yield to_line(recipe)
+            return
+
+        parser = RecipeStreamParser()
+        recipes, rejected = [], 0
+        prompt, generation_config = recipe_request(ingredients)
+        try:
+            async for chunk in gemini_client.stream_text(prompt, generation_config=generation_config):
+                for recipe in map(validate_recipe, parser.feed(chunk)):
+                    if recipe is None:
+                        rejected += 1
+                        continue
+                    recipes.append(recipe)
+                    yield to_line(recipe)
+
+            for recipe in map(validate_recipe, parser.finish()):
+                if recipe is None:
+                    rejected += 1
+                    continue
+                recipes.append(recipe)
+                yield to_line(recipe)
+        except GeminiError as e:
+            yield json.dumps({"error": f"Error generating recipes: {str(e)}"}) + "\n"
+            return
+        except ValueError as e:
+            yield json.dumps({"error": f"Failed to parse Gemini response: {str(e)}"}) + "\n"
+            return
+
+        if recipes and parser.complete and not rejected:
+            await recipe_cache.set(ingredients, {"recipes": recipes})
+        elif rejected and not recipes:
+            yield json.dumps({"error": f"Gemini returned no valid recipes ({rejected} rejected)"}) + "\n"
+
+    return StreamingResponse(recipe_lines(), media_type="application/x-ndjson")
+
+@router.get("/cache-stats", response_model=dict)
+async def get_recipe_cache_stats(
+    current_user: dict = Depends(get_current_user)
+):
+    return {
+        "recipe_cache": recipe_cache.stats(),
+        "generate_coalescing": generate_flight.stats(),
+        "recipe_match": recipe_matcher.stats(),
+        "generation_jobs": generation_queue.stats(),
+        "youtube_cache": youtube_client.cache.stats(),
+        "youtube_coalescing": youtube_client.flight.stats()
+    }
 
 @router.post("/youtube-search", response_model=YouTubeResponse)
 async def search_youtube_videos(
     request: YouTubeSearchRequest,  
     current_user: dict = Depends(get_current_user)
 ):
+    await youtube_limiter.enforce(current_user.id)
     try:
         if not YOUTUBE_API_KEY:
             raise HTTPException(
@@ -126,40 +444,17 @@ async def search_youtube_videos(
                 detail="YouTube API key not configured"
             )
 
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
-            'part': 'snippet',
-            'q': f"{request.recipe_name} recipe", 
-            'type': 'video',
-            'maxResults': 4,
-            'key': YOUTUBE_API_KEY
-        }
-
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        if 'items' not in data or not data['items']:
-            return {"videos": []}
-
-        videos = []
-        for item in data['items']:
-            video_data = {
-                'video_id': item['id']['videoId'],
-                'title': item['snippet']['title'],
-                'description': item['snippet']['description'],
-                'thumbnail_url': item['snippet']['thumbnails']['high']['url'],
-                'channel_title': item['snippet']['channelTitle'],
-                'published_at': item['snippet']['publishedAt']
-            }
-            videos.append(YouTubeVideo(**video_data))
-
-        return {"videos": videos}
+        videos = await youtube_client.search(request.recipe_name)
+        return {"videos": [YouTubeVideo(**video) for video in videos]}
 
-    except requests.RequestException as e:
+    except HTTPException:
+        raise
+    except YouTubeOverloadedError as e:
+        raise overloaded_error(f"YouTube search is busy, try again shortly: {str(e)}")
+    except YouTubeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"YouTube API request failed: {str(e)}"
+            detail=str(e)
         )
     except Exception as e:
         raise HTTPException(
@@ -167,118 +462,202 @@ async def search_youtube_videos(
             detail=f"Error searching YouTube videos: {str(e)}"
         )
 
+# INSERT ... ON CONFLICT for whichever database the app runs on
+video_insert = pg_insert if async_engine.dialect.name == "postgresql" else sqlite_insert
+
+def build_saved_recipe(user_id: int, recipe_data: SavedRecipeCreate) -> SavedRecipe:
+    return SavedRecipe(
+        user_id=user_id,
+        name=recipe_data.name,
+        ingredients_available=recipe_data.ingredients.available,
+        ingredients_needed=recipe_data.ingredients.needed,
+        instructions=[inst.dict() for inst in recipe_data.instructions],
+        prep_time=recipe_data.prep_time,
+        cook_time=recipe_data.cook_time,
+        total_time=recipe_data.total_time,
+        servings=recipe_data.servings,
+        nutrition=recipe_data.nutrition
+    )
+
+async def insert_youtube_videos(db: AsyncSession, videos: dict) -> dict:
+    # The table is shared by every user, so the first saved copy of a video is kept and later saves
+    # only link to it: nobody can rewrite the details other users' recipes show. Rows go in video_id
+    # order so concurrent saves of the same videos can't deadlock. Returns the stored rows by video_id
+    stmt = video_insert(SavedYouTubeVideo).on_conflict_do_nothing(index_elements=[SavedYouTubeVideo.video_id])
+    await db.execute(stmt, [videos[video_id] for video_id in sorted(videos)])
+    result = await db.execute(select(SavedYouTubeVideo).where(SavedYouTubeVideo.video_id.in_(list(videos))))
+    return {video.video_id: video for video in result.scalars()}
+
+async def add_saved_recipes(db: AsyncSession, user_id: int, recipes: List[SavedRecipeCreate]) -> List[tuple]:
+    # One flush assigns every recipe id; videos and their links then go out as one statement each.
+    # Returns (recipe, videos as linked and stored) pairs for the responses
+    db_recipes = [build_saved_recipe(user_id, recipe_data) for recipe_data in recipes]
+    db.add_all(db_recipes)
+    await db.flush()
+
+    videos, links, linked_ids = {}, [], []
+    for db_recipe, recipe_data in zip(db_recipes, recipes):
+        linked = []
+        for video in recipe_data.youtube_videos:
+            # A video listed twice is linked once, and its first copy is the one stored
+            videos.setdefault(video.video_id, video.dict())
+            if video.video_id not in linked:
+                links.append({"recipe_id": db_recipe.id, "video_id": video.video_id, "position": len(linked)})
+                linked.append(video.video_id)
+        linked_ids.append(linked)
+    stored = {}
+    if videos:
+        stored = await insert_youtube_videos(db, videos)
+        await db.execute(insert(SavedRecipeVideo), links)
+    await saved_recipe_search.index_recipes(db, [db_recipe.id for db_recipe in db_recipes])
+
+    return [
+        (db_recipe, [saved_video_response(stored[video_id]) for video_id in video_ids])
+        for db_recipe, video_ids in zip(db_recipes, linked_ids)
+    ]
+
+def saved_recipe_response(db_recipe: SavedRecipe, youtube_videos) -> dict:
+    return {
+        "id": db_recipe.id,
+        "user_id": db_recipe.user_id,
+        "name": db_recipe.name,
+        "ingredients": {
+            "available": db_recipe.ingredients_available,
+            "needed": db_recipe.ingredients_needed
+        },
+        "instructions": db_recipe.instructions,
+        "prep_time": db_recipe.prep_time,
+        "cook_time": db_recipe.cook_time,
+        "total_time": db_recipe.total_time,
+        "servings": db_recipe.servings,
+        "nutrition": db_recipe.nutrition,
+        "youtube_videos": youtube_videos
+    }
+
+def saved_video_response(video: SavedYouTubeVideo) -> dict:
+    return {
+        "video_id": video.video_id,
+        "title": video.title,
+        "description": video.description,
+        "thumbnail_url": video.thumbnail_url,
+        "channel_title": video.channel_title,
+        "published_at": video.published_at
+    }
+
 @router.post("/save", response_model=SavedRecipeOut)
 async def save_recipe(
     recipe_data: SavedRecipeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        # Create the recipe
-        db_recipe = SavedRecipe(
-            user_id=current_user.id,
-            name=recipe_data.name,
-            ingredients_available=json.dumps(recipe_data.ingredients.available),
-            ingredients_needed=json.dumps(recipe_data.ingredients.needed),
-            instructions=json.dumps([inst.dict() for inst in recipe_data.instructions]),
-            prep_time=recipe_data.prep_time,
-            cook_time=recipe_data.cook_time,
-            total_time=recipe_data.total_time,
-            servings=recipe_data.servings,
-            nutrition=json.dumps(recipe_data.nutrition)
-        )
-        
-        db.add(db_recipe)
-        db.commit()
-        db.refresh(db_recipe)
-        
-        # Add YouTube videos
-        for video in recipe_data.youtube_videos:
-            db_video = RecipeYouTubeVideo(
-                recipe_id=db_recipe.id,
-                video_id=video.video_id,
-                title=video.title,
-                description=video.description,
-                thumbnail_url=video.thumbnail_url,
-                channel_title=video.channel_title,
-                published_at=video.published_at
-            )
-            db.add(db_video)
-        
-        db.commit()
-        
-        response_data = {
-            "id": db_recipe.id,
-            "user_id": db_recipe.user_id,
-            "name": db_recipe.name,
-            "ingredients": {
-                "available": json.loads(db_recipe.ingredients_available),
-                "needed": json.loads(db_recipe.ingredients_needed)
-            },
-            "instructions": json.loads(db_recipe.instructions),
-            "prep_time": db_recipe.prep_time,
-            "cook_time": db_recipe.cook_time,
-            "total_time": db_recipe.total_time,
-            "servings": db_recipe.servings,
-            "nutrition": json.loads(db_recipe.nutrition),
-            "youtube_videos": recipe_data.youtube_videos
-        }
-        
-        return response_data
+        # Recipe and its videos are written in one transaction
+        db_recipe, videos = (await add_saved_recipes(db, current_user.id, [recipe_data]))[0]
+        await db.commit()
+        recipe_matcher.add([db_recipe])
+
+        return saved_recipe_response(db_recipe, videos)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error saving recipe: {str(e)}"
         )
+
+@router.post("/save/batch", response_model=List[SavedRecipeOut])
+async def save_recipes_batch(
+    batch: SavedRecipeBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        # All-or-nothing: a failure rolls back every recipe in the batch
+        saved = await add_saved_recipes(db, current_user.id, batch.recipes)
+        await db.commit()
+        recipe_matcher.add([db_recipe for db_recipe, _ in saved])
+
+        return [saved_recipe_response(db_recipe, videos) for db_recipe, videos in saved]
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving recipes: {str(e)}"
+        )
     
 
 @router.get("/saved", response_model=List[SavedRecipeOut])
 async def get_saved_recipes(
-    db: Session = Depends(get_db),
+    limit: int = Query(SAVED_RECIPES_PAGE_SIZE, ge=1, le=SAVED_RECIPES_MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Id of the last recipe on the previous page"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        recipes = db.query(SavedRecipe).filter(
-            SavedRecipe.user_id == current_user.id
-        ).all()
+        # Keyset pagination on id; videos for the whole page come from one extra SELECT
+        query = select(SavedRecipe).options(
+            selectinload(SavedRecipe.youtube_videos)
+        ).where(SavedRecipe.user_id == current_user.id)
+        if cursor is not None:
+            query = query.where(SavedRecipe.id > cursor)
+        result = await db.execute(query.order_by(SavedRecipe.id).limit(limit + 1))
+        recipes = result.scalars().all()
+
+        headers = {}
+        if len(recipes) > limit:
+            recipes = recipes[:limit]
+            headers["X-Next-Cursor"] = str(recipes[-1].id)
         
-        response = []
-        for recipe in recipes:
-            videos = [
-                {
-                    "video_id": video.video_id,
-                    "title": video.title,
-                    "description": video.description,
-                    "thumbnail_url": video.thumbnail_url,
-                    "channel_title": video.channel_title,
-                    "published_at": video.published_at
-                }
-                for video in recipe.youtube_videos
-            ]
-            
-            response.append({
-                "id": recipe.id,
-                "user_id": recipe.user_id,
-                "name": recipe.name,
-                "ingredients": {
-                    "available": json.loads(recipe.ingredients_available),
-                    "needed": json.loads(recipe.ingredients_needed)
-                },
-                "instructions": json.loads(recipe.instructions),
-                "prep_time": recipe.prep_time,
-                "cook_time": recipe.cook_time,
-                "total_time": recipe.total_time,
-                "servings": recipe.servings,
-                "nutrition": json.loads(recipe.nutrition),
-                "youtube_videos": videos
-            })
+        saved = [
+            saved_recipe_response(recipe, [saved_video_response(video) for video in recipe.youtube_videos])
+            for recipe in recipes
+        ]
         
-        return response
+        # Rows were validated on save: skip response_model re-validation and encode with orjson
+        return FastJSONResponse(saved, headers=headers)
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving saved recipes: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/saved/search", response_model=List[SavedRecipeOut])
+async def search_saved_recipes(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in recipe names, ingredients and steps"),
+    limit: int = Query(SAVED_RECIPES_PAGE_SIZE, ge=1, le=SAVED_RECIPES_MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, ge=0, description="X-Next-Cursor from the previous page of results"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        # Best match first; ranks aren't stable keys, so the cursor is an offset into the ranking
+        offset = cursor or 0
+        recipe_ids = await saved_recipe_search.search(db, current_user.id, q, limit + 1, offset)
+
+        headers = {}
+        if len(recipe_ids) > limit:
+            recipe_ids = recipe_ids[:limit]
+            headers["X-Next-Cursor"] = str(offset + limit)
+
+        recipes = {}
+        if recipe_ids:
+            result = await db.execute(
+                select(SavedRecipe).options(
+                    selectinload(SavedRecipe.youtube_videos)
+                ).where(SavedRecipe.id.in_(recipe_ids), SavedRecipe.user_id == current_user.id)
+            )
+            recipes = {recipe.id: recipe for recipe in result.scalars()}
+
+        found = [
+            saved_recipe_response(recipe, [saved_video_response(video) for video in recipe.youtube_videos])
+            for recipe in (recipes.get(recipe_id) for recipe_id in recipe_ids) if recipe is not None
+        ]
+        return FastJSONResponse(found, headers=headers)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching saved recipes: {str(e)}"
+        )
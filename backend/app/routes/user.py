@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app import models, schemas, utils, auth
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -9,17 +10,22 @@ router = APIRouter(
     tags=["users"]
 )
 
+def password_hasher_busy(e: Exception) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                         detail=str(e), headers={"Retry-After": "1"})
+
 # Signup route
 @router.post("/signup", response_model=schemas.UserOut)
-def signup(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
+async def signup(user_create: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         # Check if email already exists
-        existing_user = db.query(models.User).filter(models.User.email == user_create.email).first()
+        result = await db.execute(select(models.User).where(models.User.email == user_create.email))
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-        # Hash password
-        hashed_password = utils.hash_password(user_create.password)
+        # Hash password in the dedicated bcrypt process pool
+        hashed_password = await utils.password_hasher.hash(user_create.password)
 
         # Create user model object
         new_user = models.User(
@@ -31,13 +37,17 @@ def signup(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
 
         # Add and commit to DB
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
 
         return new_user
 
+    except HTTPException:
+        raise
+    except utils.PasswordHasherBusy as e:
+        raise password_hasher_busy(e)
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -47,25 +57,40 @@ def signup(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
 
 # Login route
 @router.post("/login", response_model=schemas.LoginResponse)
-def login(user_login: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(user_login: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
     try:
         # Find user by email
-        user = db.query(models.User).filter(models.User.email == user_login.email).first()
+        result = await db.execute(select(models.User).where(models.User.email == user_login.email))
+        user = result.scalars().first()
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-        # Verify password
-        if not utils.verify_password(user_login.password, user.hashed_password):
+        # Verify password, transparently upgrading hashes made with an old bcrypt cost
+        verified, new_hash = await utils.password_hasher.verify_and_update(user_login.password, user.hashed_password)
+        if not verified:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
 
         # Create JWT token
         access_token = auth.create_access_token(data={"user_id": user.id})
 
         return {"access_token": access_token, "user": user}
 
+    except HTTPException:
+        raise
+    except utils.PasswordHasherBusy as e:
+        raise password_hasher_busy(e)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Database error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Unexpected error: {str(e)}")
+
+
+# Password hashing pool metrics
+@router.get("/password-hasher-stats", response_model=dict)
+async def get_password_hasher_stats(current_user: dict = Depends(auth.get_current_user)):
+    return utils.password_hasher.stats()
@@ -0,0 +1,258 @@
+import asyncio
+import heapq
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List
+from sqlalchemy import bindparam, cast, func, literal, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import SAVED_SEARCH_LANGUAGE, SAVED_SEARCH_INDEX_MAX_USERS, SAVED_SEARCH_RECOUNT_SECONDS
+from app.database import async_engine
+from app.models import SavedRecipe
+from app.recipe_match import singularize
+
+TOKEN = re.compile(r"[a-z0-9]+")
+# Mostly what Postgres' english configuration drops too, so both backends match the same queries
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it my of on or that the this to was with".split()
+)
+MAX_QUERY_TERMS = 8
+# Field weights for the in-process index; Postgres uses A/B/C weights for the same fields
+NAME_WEIGHT = 3.0
+INGREDIENT_WEIGHT = 2.0
+INSTRUCTION_WEIGHT = 1.0
+# Words that only start with a query term count for less than the word itself
+PREFIX_MATCH_SHARE = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        singularize(word) for word in TOKEN.findall((text or "").lower())
+        if len(word) > 1 and word not in STOPWORDS
+    ]
+
+
+def query_terms(query: str) -> List[str]:
+    terms = []
+    for term in tokenize(query):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def search_fields(name, ingredients_available, ingredients_needed, instructions) -> tuple:
+    """The searchable text of a saved recipe: (name, ingredients, instruction steps)."""
+    ingredients = " ".join(str(item) for item in (ingredients_available or []) + (ingredients_needed or []))
+    steps = " ".join(str(step.get("description", "")) for step in instructions or [] if isinstance(step, dict))
+    return name or "", ingredients, steps
+
+
+# The search document for a saved_recipes row, computed by Postgres from the row's own columns and
+# weighted name > ingredients > steps. Used both on save and by the migration that backfills old rows.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector(CAST(:language AS regconfig), coalesce(name, '')), 'A') ||
+    setweight(to_tsvector(CAST(:language AS regconfig), coalesce((
+        SELECT string_agg(item, ' ') FROM jsonb_array_elements_text(
+            coalesce(ingredients_available, '[]'::jsonb) || coalesce(ingredients_needed, '[]'::jsonb)
+        ) AS item
+    ), '')), 'B') ||
+    setweight(to_tsvector(CAST(:language AS regconfig), coalesce((
+        SELECT string_agg(step->>'description', ' ') FROM jsonb_array_elements(
+            coalesce(instructions, '[]'::jsonb)
+        ) AS step
+    ), '')), 'C')
+"""
+UPDATE_SEARCH_VECTORS = text(
+    f"UPDATE {SavedRecipe.__tablename__} SET search_vector = {SEARCH_VECTOR_SQL} WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+
+def tsquery_text(terms: List[str]) -> str:
+    # Every term must match, each as a prefix so results show up while a word is still being typed
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class SavedRecipeSearchIndex:
+    """Inverted index over one user's saved recipes: token -> {recipe_id: field weight}.
+
+    A query term is looked up by bisecting the sorted vocabulary for every
+    token it prefixes, so a search touches only the postings of matching
+    words, however many recipes the user has.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.recipe_ids = set()
+        self.max_id = 0
+        self.counted_at = 0.0
+        self._vocabulary = None
+        # Held while catching up, so concurrent searches by one user don't load the same rows twice
+        self.lock = asyncio.Lock()
+
+    def add(self, recipe_id: int, name: str, ingredients: str, steps: str):
+        if recipe_id in self.recipe_ids:
+            return
+        self.recipe_ids.add(recipe_id)
+        self.max_id = max(self.max_id, recipe_id)
+
+        weights = {}
+        for weight, field_text in ((NAME_WEIGHT, name), (INGREDIENT_WEIGHT, ingredients), (INSTRUCTION_WEIGHT, steps)):
+            for token in tokenize(field_text):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                self._vocabulary = None
+            postings[recipe_id] = weight
+
+    def _term_weights(self, term: str) -> dict:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        weights = {}
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            token = self._vocabulary[position]
+            share = 1.0 if token == term else PREFIX_MATCH_SHARE
+            for recipe_id, weight in self.postings[token].items():
+                weights[recipe_id] = weights.get(recipe_id, 0.0) + weight * share
+            position += 1
+        return weights
+
+    def search(self, terms: List[str], limit: int, offset: int = 0) -> List[int]:
+        """Ids of recipes matching every term, best first."""
+        scores = None
+        for term in terms:
+            weights = self._term_weights(term)
+            if not weights:
+                return []
+            # Rare terms decide more of the ranking; repeats of a word saturate
+            idf = math.log(1 + len(self.recipe_ids) / len(weights))
+            if scores is None:
+                scores = {recipe_id: idf * weight / (weight + 1) for recipe_id, weight in weights.items()}
+            else:
+                scores = {
+                    recipe_id: score + idf * weights[recipe_id] / (weights[recipe_id] + 1)
+                    for recipe_id, score in scores.items() if recipe_id in weights
+                }
+            if not scores:
+                return []
+        # Newest first among equal scores, like a fresh save being what the user is looking for
+        best = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [recipe_id for recipe_id, _ in best[offset:]]
+
+
+class SavedRecipeSearch:
+    """Full-text search over a user's saved recipes.
+
+    On Postgres it queries the GIN-indexed search_vector column, filled by
+    index_recipes() in the same transaction as every save. Elsewhere it keeps an in-process SavedRecipeSearchIndex per
+    recently searching user (least recently used evicted past max_users).
+    Before each search one index lookup of the user's newest id reads in any
+    recipes saved since, including by other workers. Every recount_seconds
+    the user's row count is compared too, and the index rebuilt if a save
+    committed out of id order slipped past.
+    """
+
+    def __init__(self, max_users: int = SAVED_SEARCH_INDEX_MAX_USERS, recount_seconds: float = SAVED_SEARCH_RECOUNT_SECONDS):
+        self.max_users = max_users
+        self.recount_seconds = recount_seconds
+        self.postgres = async_engine.dialect.name == "postgresql"
+        self._indexes = OrderedDict()
+        self.searches = 0
+        self.rows_loaded = 0
+        self.rebuilds = 0
+
+    async def index_recipes(self, db: AsyncSession, recipe_ids: List[int]):
+        """Fill search_vector for freshly flushed recipes, in the caller's transaction.
+
+        One UPDATE for a whole batch, so saves keep their single multi-row
+        INSERT. A no-op off Postgres: the in-process index reads new rows
+        itself before the next search.
+        """
+        if self.postgres and recipe_ids:
+            await db.execute(UPDATE_SEARCH_VECTORS, {"ids": recipe_ids, "language": SAVED_SEARCH_LANGUAGE})
+
+    async def search(self, db: AsyncSession, user_id: int, query: str, limit: int, offset: int = 0) -> List[int]:
+        """Ids of the user's recipes matching every word of query, best first."""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        self.searches += 1
+        if self.postgres:
+            return await self._search_postgres(db, user_id, terms, limit, offset)
+        index = await self._index_for(db, user_id)
+        return index.search(terms, limit, offset)
+
+    async def _search_postgres(self, db: AsyncSession, user_id: int, terms: List[str], limit: int, offset: int) -> List[int]:
+        tsquery = func.to_tsquery(cast(literal(SAVED_SEARCH_LANGUAGE), REGCONFIG), tsquery_text(terms))
+        rank = func.ts_rank_cd(SavedRecipe.search_vector, tsquery)
+        result = await db.execute(
+            select(SavedRecipe.id)
+            .where(SavedRecipe.user_id == user_id, SavedRecipe.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc(), SavedRecipe.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(result.scalars())
+
+    async def _index_for(self, db: AsyncSession, user_id: int) -> SavedRecipeSearchIndex:
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = self._indexes[user_id] = SavedRecipeSearchIndex()
+            if len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(user_id)
+
+        async with index.lock:
+            # The newest id is an index lookup; counting rows costs a scan of the user's
+            # recipes, so the count is only rechecked every recount_seconds
+            recount = time.monotonic() - index.counted_at >= self.recount_seconds
+            if recount:
+                latest_id, count = (await db.execute(
+                    select(func.max(SavedRecipe.id), func.count(SavedRecipe.id)).where(SavedRecipe.user_id == user_id)
+                )).one()
+            else:
+                latest_id = await db.scalar(select(func.max(SavedRecipe.id)).where(SavedRecipe.user_id == user_id))
+            if (latest_id or 0) > index.max_id:
+                await self._load(db, user_id, index, after_id=index.max_id)
+            if not recount:
+                return index
+            if count == len(index.recipe_ids):
+                index.counted_at = time.monotonic()
+                return index
+        # A save committed below the newest id, or rows went away: start this user over
+        self.rebuilds += 1
+        index = SavedRecipeSearchIndex()
+        await self._load(db, user_id, index, after_id=0)
+        index.counted_at = time.monotonic()
+        self._indexes[user_id] = index
+        return index
+
+    async def _load(self, db: AsyncSession, user_id: int, index: SavedRecipeSearchIndex, after_id: int):
+        result = await db.execute(
+            select(SavedRecipe.id, SavedRecipe.name, SavedRecipe.ingredients_available,
+                   SavedRecipe.ingredients_needed, SavedRecipe.instructions)
+            .where(SavedRecipe.user_id == user_id, SavedRecipe.id > after_id)
+        )
+        for row in result:
+            index.add(row.id, *search_fields(row.name, row.ingredients_available,
+                                             row.ingredients_needed, row.instructions))
+            self.rows_loaded += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": "postgres" if self.postgres else "memory",
+            "users_indexed": len(self._indexes),
+            "recipes_indexed": sum(len(index.recipe_ids) for index in self._indexes.values()),
+            "searches": self.searches,
+            "rows_loaded": self.rows_loaded,
+            "rebuilds": self.rebuilds,
+        }
+
+
+saved_recipe_search = SavedRecipeSearch()
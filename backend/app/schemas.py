@@ -1,5 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
+from datetime import datetime
+from app.config import SAVE_BATCH_MAX_RECIPES, GENERATE_BATCH_MAX_ITEMS
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -33,6 +35,7 @@ class RecipeInstruction(BaseModel):
     description: Optional[str] = "No description provided"
     class Config:
         extra = "allow"  # Accept extra fields
+        coerce_numbers_to_str = True  # Gemini sometimes sends "step": 1
 
 class RecipeIngredientGroups(BaseModel):
     available: Optional[List[str]] = Field(default_factory=list)
@@ -40,6 +43,15 @@ class RecipeIngredientGroups(BaseModel):
     class Config:
         extra = "allow"
 
+class RecipeNutrition(BaseModel):
+    protein: Optional[str] = "N/A"
+    carbs: Optional[str] = "N/A"
+    fat: Optional[str] = "N/A"
+    sugars: Optional[str] = "N/A"
+    class Config:
+        extra = "allow"
+        coerce_numbers_to_str = True  # e.g. "protein": 10, as pydantic v1 accepted
+
 class GeneratedRecipe(BaseModel):
     name: Optional[str] = "Unnamed Recipe"
     ingredients: Optional[RecipeIngredientGroups] = Field(default_factory=dict)
@@ -48,14 +60,44 @@ class GeneratedRecipe(BaseModel):
     cook_time: Optional[str] = "N/A"
     total_time: Optional[str] = "N/A"
     servings: Optional[int] = 1
+    nutrition: Optional[RecipeNutrition] = Field(default_factory=dict)
     class Config:
         extra = "allow"
+        coerce_numbers_to_str = True  # e.g. "prep_time": 10
 
 class RecipeResponse(BaseModel):
     recipes: Optional[List[GeneratedRecipe]] = Field(default_factory=list)
     class Config:
         extra = "allow"
 
+class RecipeBatchGenerateRequest(BaseModel):
+    requests: List[RecipeIngredientsRequest] = Field(..., min_items=1, max_items=GENERATE_BATCH_MAX_ITEMS)
+
+class RecipeBatchItem(BaseModel):
+    index: int
+    status_code: int
+    source: Optional[str] = None
+    recipes: Optional[List[GeneratedRecipe]] = None
+    error: Optional[str] = None
+
+class RecipeBatchResponse(BaseModel):
+    results: List[RecipeBatchItem]
+
+class GenerationJobOut(BaseModel):
+    id: str
+    status: str
+    status_code: Optional[int] = None
+    source: Optional[str] = None
+    recipes: Optional[List[GeneratedRecipe]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: datetime
+
+    class Config:
+        orm_mode = True
+
 class YouTubeSearchRequest(BaseModel):
     recipe_name: str
     
@@ -81,6 +123,9 @@ class SavedRecipeCreate(BaseModel):
     nutrition: Dict[str, str]
     youtube_videos: List[YouTubeVideo]
 
+class SavedRecipeBatchCreate(BaseModel):
+    recipes: List[SavedRecipeCreate] = Field(..., min_items=1, max_items=SAVE_BATCH_MAX_RECIPES)
+
 class SavedRecipeOut(BaseModel):
     id: int
     user_id: int
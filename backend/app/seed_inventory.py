@@ -1,29 +1,125 @@
-import json
+import argparse
+import os
+import time
+import ijson
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Inventory
-import os
+from app.inventory_snapshot import bump_inventory_version
+
+DEFAULT_INVENTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'inventory.json')
+UPDATABLE_FIELDS = ("category", "unit", "description", "image_url")
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def iter_inventory_items(json_path: str = DEFAULT_INVENTORY_PATH):
+    """Yield catalog rows as dicts from either supported file layout, streamed so large catalogs aren't loaded whole.
+
+    - {"Category": ["Name", {"name": ..., "unit": ...}, ...]}  (bundled inventory.json)
+    - [{"name": ..., "category": ..., "unit": ..., ...}, ...]   (supplier catalog)
+    """
+    with open(json_path, 'rb') as file:
+        first = file.read(1)
+        while first.isspace():
+            first = file.read(1)
+        file.seek(0)
+
+        if first == b"{":
+            groups = ijson.kvitems(file, "")
+        else:
+            groups = [(None, ijson.items(file, "item"))]
+
+        for category, items in groups:
+            for item in items:
+                row = {"name": item} if isinstance(item, str) else dict(item)
+                if category is not None:
+                    row.setdefault("category", category)
+                yield row
+
+def batched(rows, batch_size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-def load_inventory_data():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(script_dir, 'inventory.json')
-    
-    with open(json_path, 'r') as file:
-        return json.load(file)
+def upsert_inventory_batch(db: Session, batch: list) -> dict:
+    # Last occurrence wins when a name repeats inside one batch
+    rows = {}
+    for row in batch:
+        rows[row["name"]] = {"name": row["name"], **{f: row.get(f) for f in UPDATABLE_FIELDS}}
 
-def seed_inventory():
+    existing = {
+        item.name: item
+        for item in db.execute(
+            select(Inventory.name, *(getattr(Inventory, f) for f in UPDATABLE_FIELDS))
+            .where(Inventory.name.in_(rows))
+        )
+    }
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    changed = []
+    for name, row in rows.items():
+        current = existing.get(name)
+        if current is None:
+            counts["inserted"] += 1
+            changed.append(row)
+        elif any(row[f] is not None and row[f] != getattr(current, f) for f in UPDATABLE_FIELDS):
+            counts["updated"] += 1
+            changed.append(row)
+        else:
+            counts["unchanged"] += 1
+
+    if changed:
+        insert = UPSERT_DIALECTS[db.bind.dialect.name]
+        stmt = insert(Inventory)
+        # Fields missing from the source keep their stored value
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Inventory.name],
+            set_={f: func.coalesce(getattr(stmt.excluded, f), getattr(Inventory, f)) for f in UPDATABLE_FIELDS}
+        )
+        # executemany: compiled once, sent as multi-row VALUES batches by the driver layer
+        db.execute(stmt, changed)
+
+    return counts
+
+def seed_inventory(json_path: str = DEFAULT_INVENTORY_PATH, batch_size: int = 1000) -> dict:
     db: Session = SessionLocal()
-    inventory_data = load_inventory_data()
-    
-    for category, items in inventory_data.items():
-        for item_name in items:
-            existing = db.query(Inventory).filter_by(name=item_name).first()
-            if not existing:
-                db.add(Inventory(name=item_name, category=category))
-    
-    db.commit()
-    db.close()
-    print("Inventory seeded successfully ✅")
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+    start = time.perf_counter()
+
+    try:
+        if db.bind.dialect.name not in UPSERT_DIALECTS:
+            raise ValueError(f"Bulk upsert is not supported on {db.bind.dialect.name}")
+
+        for batch in batched(iter_inventory_items(json_path), batch_size):
+            for key, value in upsert_inventory_batch(db, batch).items():
+                totals[key] += value
+
+        # Let running API workers know their inventory snapshot is stale
+        if totals["inserted"] or totals["updated"]:
+            bump_inventory_version(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    totals["seconds"] = round(time.perf_counter() - start, 3)
+    print(
+        f"Inventory seeded successfully ✅ inserted={totals['inserted']} "
+        f"updated={totals['updated']} unchanged={totals['unchanged']} in {totals['seconds']}s"
+    )
+    return totals
 
 if __name__ == "__main__":
-    seed_inventory()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Bulk upsert the inventory catalog")
+    parser.add_argument("path", nargs="?", default=DEFAULT_INVENTORY_PATH)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    seed_inventory(args.path, args.batch_size)
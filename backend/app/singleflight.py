@@ -0,0 +1,45 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one shared upstream task.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task. A caller being cancelled never cancels
+    the shared task, and failures are delivered to every waiter and then
+    forgotten so the next call retries.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _forget(self, key, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        # Retrieve the exception so it isn't reported as unhandled when every waiter left
+        if task.exception() is not None:
+            self.failures += 1
+
+    async def do(self, key, func):
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import random
+from app.config import (
+    CREATE_TABLES_ON_STARTUP,
+    RUN_MIGRATIONS_ON_STARTUP,
+    STARTUP_RETRY_MAX_DELAY_SECONDS,
+    RECIPE_MATCH_ENABLED,
+)
+from app.database import Base, async_engine
+from app.gemini import gemini_client
+from app.inventory_search import inventory_search
+from app.migrations import apply_migrations
+from app.recipe_match import recipe_matcher
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """What the readiness probe reports while the worker finishes starting up."""
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error = None
+
+
+startup_state = StartupState()
+
+
+async def prepare_database():
+    if CREATE_TABLES_ON_STARTUP:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    if RUN_MIGRATIONS_ON_STARTUP:
+        # create_all() never changes existing tables, and the routes rely on the upgraded schema
+        # (search_vector, JSONB columns, shared videos). Every migration is idempotent, so a worker
+        # that loses a race with another one fails this attempt and finds nothing left to do on retry.
+        await asyncio.to_thread(apply_migrations)
+    # Build the inventory snapshot and search index before the first request needs them
+    await asyncio.to_thread(inventory_search.get)
+
+
+async def prepare_app():
+    """Runs in the background from the lifespan hook, so the server starts accepting
+    connections (and answering liveness) immediately. A briefly unavailable database
+    only delays readiness; the worker keeps retrying instead of crashing."""
+    delay = 0.5
+    while True:
+        startup_state.attempts += 1
+        try:
+            await prepare_database()
+            break
+        except Exception as e:
+            startup_state.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Startup attempt %d failed: %s", startup_state.attempts, startup_state.last_error)
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, STARTUP_RETRY_MAX_DELAY_SECONDS)
+
+    startup_state.ready = True
+    startup_state.last_error = None
+
+    # Not part of readiness: until these finish, /generate just goes to Gemini
+    if RECIPE_MATCH_ENABLED:
+        try:
+            added = await asyncio.to_thread(recipe_matcher.refresh)
+            logger.info("Recipe match index loaded %d saved recipes", added)
+        except Exception as e:
+            logger.warning("Recipe match index load failed: %s", e)
+    try:
+        await asyncio.to_thread(gemini_client.warm)
+    except Exception as e:
+        logger.warning("Gemini client warm-up failed: %s", e)
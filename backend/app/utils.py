@@ -1,9 +1,102 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
+from app.metrics import registry, Histogram
+from app.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a different cost than BCRYPT_ROUNDS are reported as needing an update
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    # Returns (matches, new_hash); new_hash is set when the stored cost is outdated
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+password_hash_duration = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify latency including queue wait",
+    labelnames=("operation",)
+))
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool with a bounded queue.
+
+    Keeps CPU-heavy hashing off the shared threadpool and the GIL; when more than
+    max_queue hashes are pending, callers get PasswordHasherBusy immediately.
+    """
+
+    def __init__(self, max_workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a worker that already runs the event loop, the threadpool and aiosqlite
+            # threads can deadlock the children; start them from a clean process instead
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context(method)
+            )
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        # Only touched from the event loop thread, so the counters need no lock
+        if self.in_flight >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password hashing requests, try again shortly")
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            password_hash_duration.observe(elapsed, operation=operation)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str):
+        return await self._run("verify", verify_and_update_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+            "max_latency_seconds": self.max_seconds,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
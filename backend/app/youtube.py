@@ -0,0 +1,126 @@
+import httpx
+from app.cache import TTLCache
+from app.singleflight import SingleFlight
+from app.metrics import observe_upstream
+from app.config import (
+    YOUTUBE_API_KEY,
+    YOUTUBE_API_BASE_URL,
+    YOUTUBE_TIMEOUT_SECONDS,
+    YOUTUBE_MAX_CONNECTIONS,
+    YOUTUBE_MAX_WAITING,
+    YOUTUBE_CACHE_MAX_ENTRIES,
+    YOUTUBE_CACHE_TTL_SECONDS,
+)
+
+
+class YouTubeError(Exception):
+    pass
+
+
+class YouTubeOverloadedError(YouTubeError):
+    """Every connection is busy and the wait line is full; raised at once instead of queueing."""
+
+
+def normalize_recipe_name(recipe_name: str) -> str:
+    return " ".join(recipe_name.lower().split())
+
+
+class YouTubeClient:
+    """Shared keep-alive HTTP client for the YouTube Data API with a TTL result cache."""
+
+    def __init__(
+        self,
+        api_key: str = YOUTUBE_API_KEY,
+        base_url: str = YOUTUBE_API_BASE_URL,
+        timeout: float = YOUTUBE_TIMEOUT_SECONDS,
+        max_connections: int = YOUTUBE_MAX_CONNECTIONS,
+        cache: TTLCache = None,
+        max_waiting: int = YOUTUBE_MAX_WAITING,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_waiting = max_waiting
+        self.in_flight = 0
+        self.shed = 0
+        self.cache = cache or TTLCache(YOUTUBE_CACHE_MAX_ENTRIES, YOUTUBE_CACHE_TTL_SECONDS)
+        self.flight = SingleFlight()
+        self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60
+                )
+            )
+        return self._client
+
+    async def search(self, recipe_name: str) -> list:
+        key = normalize_recipe_name(recipe_name)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        return await self.flight.do(key, lambda: self._fetch(recipe_name, key))
+
+    async def _fetch(self, recipe_name: str, key: str) -> list:
+        # Load shedding: past the pool plus its wait line, fail fast rather than queue for a connection
+        if self.in_flight >= self.max_connections + self.max_waiting:
+            self.shed += 1
+            raise YouTubeOverloadedError("YouTube search is at capacity")
+        self.in_flight += 1
+        try:
+            return await self._fetch_videos(recipe_name, key)
+        finally:
+            self.in_flight -= 1
+
+    async def _fetch_videos(self, recipe_name: str, key: str) -> list:
+        params = {
+            'part': 'snippet',
+            'q': f"{recipe_name} recipe",
+            'type': 'video',
+            'maxResults': 4,
+            'key': self.api_key
+        }
+        try:
+            with observe_upstream("youtube"):
+                response = await self._get_client().get("/search", params=params)
+                response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            raise YouTubeError(f"YouTube API request failed: {str(e)}")
+
+        videos = []
+        for item in data.get('items') or []:
+            videos.append({
+                'video_id': item['id']['videoId'],
+                'title': item['snippet']['title'],
+                'description': item['snippet']['description'],
+                'thumbnail_url': item['snippet']['thumbnails']['high']['url'],
+                'channel_title': item['snippet']['channelTitle'],
+                'published_at': item['snippet']['publishedAt']
+            })
+
+        self.cache.set(key, videos)
+        return videos
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_flight": self.in_flight,
+            "max_waiting": self.max_waiting,
+            "shed": self.shed,
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+youtube_client = YouTubeClient()
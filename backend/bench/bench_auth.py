@@ -0,0 +1,61 @@
+"""Per-request overhead of get_current_user with and without the auth caches.
+
+Run from backend/:  python -m bench.bench_auth --requests 5000
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from sqlalchemy import event
+from app import auth
+from app.database import Base, SessionLocal, engine
+from app.models import User
+
+
+def seed_user() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email=f"bench{time.time_ns()}@example.com", hashed_password="x", name="Bench")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def measure(token: str, requests: int, cached: bool):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        if not cached:
+            auth.token_cache.invalidate()
+            auth.user_cache.invalidate()
+        auth.get_current_user(token)
+    elapsed = time.perf_counter() - start
+
+    event.remove(engine, "before_cursor_execute", listener)
+    return elapsed / requests, len(statements) / requests
+
+
+def main(requests: int):
+    token = auth.create_access_token({"user_id": seed_user()})
+    for label, cached in (("uncached", False), ("cached", True)):
+        per_request, queries = measure(token, requests, cached)
+        print(f"{label:>8}: {per_request * 1e6:8.1f} us/request  {queries:.2f} queries/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,34 @@
+"""Show that concurrent generate calls overlap instead of serializing.
+
+Run from backend/:  python -m bench.bench_gemini_concurrency --calls 8 --latency 1
+"""
+import argparse
+import asyncio
+import time
+from app.gemini import GeminiClient
+from bench.fake_gemini import FakeGeminiModel, AsyncFakeGeminiModel
+
+
+async def run(calls: int, latency: float, concurrency: int, sync_model: bool):
+    # The sync fake forces the client onto its worker-thread fallback
+    model_class = FakeGeminiModel if sync_model else AsyncFakeGeminiModel
+    model = model_class(latency=latency)
+    client = GeminiClient(model=model, max_concurrency=concurrency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.generate_text("prompt") for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+
+    serial = calls * latency
+    print(f"calls={calls} latency={latency}s concurrency={concurrency} sync_model={sync_model}")
+    print(f"elapsed={elapsed:.2f}s serialized_would_take={serial:.2f}s speedup={serial / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sync-model", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.latency, args.concurrency, args.sync_model))
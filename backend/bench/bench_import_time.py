@@ -0,0 +1,94 @@
+"""Import-time budget check for app.main.
+
+Imports the app in fresh interpreters with the database pointed somewhere
+unreachable, so any I/O at import time fails loudly, and exits non-zero when
+the best-of-N import time exceeds the budget or a lazily loaded SDK sneaks
+back onto the import path.
+
+Run from backend/:  python -m bench.bench_import_time --budget 1.5 --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Heavy client libraries that must only load on first use
+LAZY_MODULES = ("google.generativeai", "google.api_core.exceptions", "grpc")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {lazy!r} if name in sys.modules))
+"""
+
+
+def probe_env() -> dict:
+    env = dict(os.environ)
+    # A path whose parent does not exist: opening it would raise, so import must not touch it
+    env["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/missing-dir-{os.getpid()}/app.db"
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.pop("ACCESS_TOKEN_EXPIRE_MINUTES", None)  # must have a default
+    return env
+
+
+def import_once() -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=BACKEND_DIR, env=probe_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing app.main failed:\n{result.stderr}")
+    elapsed, loaded = result.stdout.splitlines()[-2:]
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def slowest_imports(count: int = 10) -> list:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=probe_env(), capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].rstrip()
+            # Top-level imports of app.main and its app.* modules are the useful view
+            if len(name) - len(name.lstrip()) <= 3 or name.strip().startswith("app."):
+                rows.append((int(parts[1]), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main(budget: float, runs: int):
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        elapsed, loaded = import_once()
+        timings.append(elapsed)
+
+    best = min(timings)
+    print(f"import app.main: best {best * 1000:.0f} ms, worst {max(timings) * 1000:.0f} ms over {runs} runs")
+    print("slowest imports (cumulative):")
+    for microseconds, name in slowest_imports():
+        print(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if best > budget:
+        failures.append(f"import took {best:.2f}s, budget is {budget:.2f}s")
+    if loaded:
+        failures.append(f"loaded at import time but should be lazy: {', '.join(loaded)}")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print("OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=1.5, help="Seconds allowed for the best run")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.budget, args.runs)
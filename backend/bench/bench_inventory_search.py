@@ -0,0 +1,78 @@
+"""Inventory autocomplete: in-memory index vs SQL ILIKE scan on a large catalog.
+
+Run from backend/:  python -m bench.bench_inventory_search --items 50000
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from sqlalchemy import select
+from app.database import Base, SessionLocal, engine
+from app.inventory_search import inventory_search
+from app.inventory_snapshot import bump_inventory_version
+from app.models import Inventory
+
+WORDS = ["red", "green", "baby", "organic", "fresh", "dried", "roasted", "wild", "sweet", "smoked"]
+BASES = ["potato", "onion", "tomato", "spinach", "lentil", "chickpea", "paneer", "mango", "garlic", "basil"]
+QUERIES = ["pot", "red on", "chikpea", "organic mang", "smoked pap", "tomatoe", "bas", "lent"]
+
+
+def seed(items: int):
+    Base.metadata.create_all(bind=engine)
+    rows = [
+        {"name": f"{random.choice(WORDS)} {random.choice(BASES)} {i}", "category": "Bulk"}
+        for i in range(items)
+    ]
+    db = SessionLocal()
+    db.execute(Inventory.__table__.insert(), rows)
+    bump_inventory_version(db)
+    db.commit()
+    db.close()
+
+
+def time_per_query(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - start) / (rounds * len(QUERIES))
+
+
+def main(items: int, rounds: int, limit: int):
+    seed(items)
+
+    start = time.perf_counter()
+    index = inventory_search.get()
+    build = time.perf_counter() - start
+
+    db = SessionLocal()
+
+    def ilike(query):
+        return db.execute(
+            select(Inventory.id, Inventory.name).where(Inventory.name.ilike(f"%{query}%")).limit(limit)
+        ).all()
+
+    index_time = time_per_query(lambda q: index.search(q, limit), rounds)
+    sql_time = time_per_query(ilike, max(1, rounds // 20))
+    db.close()
+
+    print(f"dialect={engine.dialect.name} items={items} index_build={build:.2f}s")
+    print(f"index search: {index_time * 1000:.3f} ms/query")
+    print(f"sql ilike:    {sql_time * 1000:.3f} ms/query")
+    for query in QUERIES[:3]:
+        print(f"  {query!r} -> {[r['name'] for r in index.search(query, 3)]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    main(args.items, args.rounds, args.limit)
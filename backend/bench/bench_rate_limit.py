@@ -0,0 +1,118 @@
+"""Overhead of the per-user rate limiter.
+
+Times RateLimiter.acquire() directly on each backend, then serves the same
+trivial authenticated route with and without an enforce() call through the
+ASGI stack, so the difference is what the limiter adds to a real request.
+
+Run from backend/:  python -m bench.bench_rate_limit --calls 100000 --requests 10000
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+import httpx
+from fastapi import Depends, FastAPI
+from app.auth import CurrentUser, create_access_token, get_current_user
+from app.database import Base, SessionLocal, async_engine
+from app.models import User
+from app.ratelimit import DatabaseRateLimitBackend, MemoryRateLimitBackend, RateLimiter
+
+
+def limiter(backend) -> RateLimiter:
+    # Generous enough that every call is allowed, the common case worth measuring
+    return RateLimiter("bench", per_minute=1e9, burst=1000, backend=backend)
+
+
+async def time_acquire(backend, calls: int, users: int) -> float:
+    rate_limiter = limiter(backend)
+    start = time.perf_counter()
+    for i in range(calls):
+        await rate_limiter.acquire(i % users)
+    return (time.perf_counter() - start) / calls
+
+
+def bench_app(rate_limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain(current_user: CurrentUser = Depends(get_current_user)):
+        return {"ok": True}
+
+    @app.get("/limited")
+    async def limited(current_user: CurrentUser = Depends(get_current_user)):
+        await rate_limiter.enforce(current_user.id)
+        return {"ok": True}
+
+    return app
+
+
+def seed_user() -> int:
+    db = SessionLocal()
+    user = User(email=f"bench{time.time_ns()}@example.com", hashed_password="x", name="Bench")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+async def time_requests(app: FastAPI, requests: int) -> dict:
+    # A real token rather than dependency_overrides, which FastAPI re-analyzes on every request;
+    # after the first call both routes hit the auth caches
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': seed_user()})}"}
+    samples = {"/plain": [], "/limited": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for _ in range(50):
+            await client.get("/plain")
+            await client.get("/limited")
+        # Interleaved so drift affects both routes equally
+        for _ in range(requests):
+            for path, path_samples in samples.items():
+                start = time.perf_counter()
+                response = await client.get(path)
+                path_samples.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+    return samples
+
+
+def summary(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    return f"p50 {statistics.median(samples) * 1e6:8.1f} us   p99 {p99 * 1e6:8.1f} us"
+
+
+async def main(calls: int, requests: int, users: int, database_calls: int):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    memory = await time_acquire(MemoryRateLimitBackend(max_keys=100000), calls, users)
+    print(f"acquire (memory):   {memory * 1e6:8.2f} us/call over {calls} calls, {users} users")
+    database = await time_acquire(DatabaseRateLimitBackend(), database_calls, users)
+    print(f"acquire (database): {database * 1e6:8.2f} us/call over {database_calls} calls "
+          f"({async_engine.dialect.name})")
+
+    samples = await time_requests(bench_app(limiter(MemoryRateLimitBackend(max_keys=100000))), requests)
+    for path, path_samples in samples.items():
+        print(f"GET {path:<9} {summary(path_samples)}")
+    overhead = statistics.median(samples["/limited"]) - statistics.median(samples["/plain"])
+    print(f"limiter overhead at p50: {overhead * 1e6:+.1f} us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--database-calls", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.requests, args.users, args.database_calls))
@@ -0,0 +1,109 @@
+"""Recipe match engine at scale: build, incremental add and query latency.
+
+Builds a RecipeMatchIndex over a synthetic corpus (inventory names plus
+generated extras, Zipf-distributed so staples like onion appear in a large
+share of recipes; the default of 28000 extras gives a vocabulary the size of
+a large real collection's), then times pantry queries against the index and against a
+plain Python set scan over the same corpus.
+
+Run from backend/:  python -m bench.bench_recipe_match --recipes 100000 --queries 1000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.recipe_match import RecipeMatchIndex, normalize_ingredient
+
+INVENTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "inventory.json")
+
+
+def vocabulary(extra: int) -> list:
+    with open(INVENTORY_PATH) as file:
+        data = json.load(file)
+    names = [item if isinstance(item, str) else item["name"] for items in data.values() for item in items]
+    return names + [f"{random.choice(names)} variant {i}" for i in range(extra)]
+
+
+def synthetic_corpus(count: int, names: list, rng: random.Random) -> list:
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    return [
+        (recipe_id, f"recipe {recipe_id}", rng.choices(names, weights, k=rng.randint(4, 10)))
+        for recipe_id in range(1, count + 1)
+    ]
+
+
+def naive_match(corpus_sets: list, pantry: set, limit: int, min_coverage: float, max_missing: int) -> list:
+    scored = []
+    for recipe_id, required in corpus_sets:
+        if not required:
+            continue
+        matched = len(required & pantry)
+        if matched / len(required) >= min_coverage and len(required) - matched <= max_missing:
+            scored.append((-matched / len(required), -matched, recipe_id))
+    return sorted(scored)[:limit]
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def summary(label: str, samples: list):
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    print(f"{label:>22}: p50 {statistics.median(samples) * 1000:8.3f} ms   p99 {p99 * 1000:8.3f} ms")
+
+
+def main(recipes: int, queries: int, extra_ingredients: int, naive_queries: int):
+    rng = random.Random(42)
+    names = vocabulary(extra_ingredients)
+    corpus = synthetic_corpus(recipes, names, rng)
+
+    index = RecipeMatchIndex()
+    build = timed(index.add_many, corpus)
+    stats = index.stats()
+    print(f"build {recipes} recipes: {build:.2f}s  ({stats['ingredients']} ingredients, "
+          f"{stats['postings_bytes'] / 1e6:.1f} MB postings)")
+
+    new_recipes = synthetic_corpus(1000, names, rng)
+    new_recipes = [(recipes + recipe_id, name, items) for recipe_id, name, items in new_recipes]
+    adds = [timed(index.add_many, [recipe]) for recipe in new_recipes]
+    summary("incremental add", adds)
+
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    pantries = [rng.choices(names, weights, k=rng.randint(3, 12)) for _ in range(queries)]
+    hits = 0
+    samples = []
+    for pantry in pantries:
+        start = time.perf_counter()
+        matches = index.match(pantry, 2, 0.75, 2)
+        samples.append(time.perf_counter() - start)
+        hits += len(matches) >= 2
+    summary("index match", samples)
+    print(f"{'':>22}  {hits}/{queries} pantries had 2+ good matches")
+
+    corpus_sets = [
+        (recipe_id, {n for n in map(normalize_ingredient, items) if n not in index.staples})
+        for recipe_id, _, items in corpus
+    ]
+    naive = [
+        timed(naive_match, corpus_sets, {normalize_ingredient(item) for item in pantry}, 2, 0.75, 2)
+        for pantry in pantries[:naive_queries]
+    ]
+    summary("python set scan", naive)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--extra-ingredients", type=int, default=28000)
+    parser.add_argument("--naive-queries", type=int, default=20)
+    args = parser.parse_args()
+    main(args.recipes, args.queries, args.extra_ingredients, args.naive_queries)
@@ -0,0 +1,91 @@
+"""Read throughput of saved recipe payloads: legacy JSON-in-Text vs native JSON columns.
+
+Run from backend/:  python -m bench.bench_saved_json --rows 5000
+Uses a throwaway SQLite database unless DATABASE_URL is already set (point it at
+Postgres to measure JSONB).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, insert, select
+from app.database import engine
+from app.models import JSONType
+
+metadata = MetaData()
+COLUMNS = ("ingredients_available", "ingredients_needed", "instructions", "nutrition")
+
+
+def payload(i: int) -> dict:
+    return {
+        "ingredients_available": ["potato", "onion", "tomato", f"spice {i}"],
+        "ingredients_needed": ["salt", "pepper", "oil"],
+        "instructions": [{"step": str(n), "description": f"Step {n} of recipe {i}"} for n in range(1, 9)],
+        "nutrition": {"protein": "10g", "carbs": "30g", "fat": "15g", "sugars": "5g"},
+    }
+
+
+def make_table(name: str, column_type) -> Table:
+    return Table(
+        name, metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String),
+        *(Column(c, column_type) for c in COLUMNS)
+    )
+
+
+legacy = make_table("bench_saved_text", Text)
+native = make_table("bench_saved_json", JSONType)
+
+
+def read_legacy() -> int:
+    with engine.connect() as conn:
+        rows = conn.execute(select(legacy)).mappings().all()
+    out = [{**row, **{c: json.loads(row[c]) for c in COLUMNS}} for row in rows]
+    return len(out)
+
+
+def read_native() -> int:
+    with engine.connect() as conn:
+        rows = conn.execute(select(native)).mappings().all()
+    out = [dict(row) for row in rows]
+    return len(out)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(rows: int, repeat: int):
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    data = [{"id": i, "name": f"Recipe {i}", **payload(i)} for i in range(rows)]
+    with engine.begin() as conn:
+        conn.execute(insert(legacy), [{**d, **{c: json.dumps(d[c]) for c in COLUMNS}} for d in data])
+        conn.execute(insert(native), data)
+
+    legacy_time = best_of(read_legacy, repeat)
+    native_time = best_of(read_native, repeat)
+    metadata.drop_all(engine)
+
+    print(f"dialect={engine.dialect.name} rows={rows}")
+    print(f"legacy text+json.loads: {legacy_time * 1000:.1f} ms ({rows / legacy_time:,.0f} rows/s)")
+    print(f"native json column:     {native_time * 1000:.1f} ms ({rows / native_time:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,84 @@
+"""Check that /recipes/saved issues a constant number of queries per page.
+
+Run from backend/:  python -m bench.bench_saved_queries --recipes 500 --videos 4
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.auth import get_current_user
+from app.database import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.models import User, SavedRecipe, SavedRecipeVideo, SavedYouTubeVideo
+
+
+def seed(recipes: int, videos: int) -> User:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email=f"bench{time.time_ns()}@example.com", hashed_password="x", name="Bench")
+    db.add(user)
+    db.flush()
+    for i in range(recipes):
+        recipe = SavedRecipe(
+            user_id=user.id, name=f"Recipe {i}",
+            ingredients_available=["potato"], ingredients_needed=["salt"],
+            instructions=[{"step": "1", "description": "Cook"}],
+            prep_time="5 mins", cook_time="10 mins", total_time="15 mins",
+            servings=2, nutrition={"protein": "5g"}
+        )
+        db.add(recipe)
+        db.flush()
+        for j in range(videos):
+            db.add(SavedYouTubeVideo(
+                video_id=f"v{i}-{j}", title="t", description="d",
+                thumbnail_url="u", channel_title="c", published_at="p"
+            ))
+            db.add(SavedRecipeVideo(recipe_id=recipe.id, video_id=f"v{i}-{j}", position=j))
+    db.commit()
+    db.close()
+    return user
+
+
+def main(recipes: int, videos: int, limit: int):
+    user = seed(recipes, videos)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    client = TestClient(app)
+    cursor, pages, counts = None, 0, set()
+    start = time.perf_counter()
+    while True:
+        statements.clear()
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/recipes/saved", params=params)
+        response.raise_for_status()
+        counts.add(len(statements))
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    elapsed = time.perf_counter() - start
+
+    print(f"recipes={recipes} videos_per_recipe={videos} page_size={limit}")
+    print(f"pages={pages} queries_per_page={sorted(counts)} elapsed={elapsed:.2f}s")
+    assert len(counts) == 1, f"query count varies between pages: {sorted(counts)}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--videos", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    main(args.recipes, args.videos, args.limit)
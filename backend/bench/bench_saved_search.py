@@ -0,0 +1,154 @@
+"""Saved recipe search latency as a user's collection grows.
+
+Seeds one user per collection size, then for a mix of queries times the
+ranked id lookup behind GET /recipes/saved/search next to the same lookup done
+as a LIKE scan over the recipe columns (what searching without an index
+costs), and the whole route, which also loads and encodes the page of
+recipes. The first search for each user, which reads the collection into the
+in-process index on non-Postgres databases, is reported separately.
+
+Run from backend/:  python -m bench.bench_saved_search --sizes 100 1000 5000 --requests 200
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from sqlalchemy import String, and_, cast, select, text
+from app.auth import create_access_token
+from app.config import SAVED_SEARCH_LANGUAGE
+from app.database import AsyncSessionLocal, Base, SessionLocal, engine
+from app.models import SavedRecipe, User
+from app.saved_search import SEARCH_VECTOR_SQL, query_terms, saved_recipe_search
+
+INGREDIENTS = (
+    "chickpeas tomatoes onion garlic ginger spinach potato cauliflower lentils rice paneer chicken beef pork "
+    "tofu mushrooms peppers carrots peas corn beans coconut yogurt cream butter cheese eggs pasta noodles "
+    "basil coriander cumin turmeric paprika chilli lemon lime honey soy sesame peanut almonds zucchini "
+    "eggplant broccoli cabbage kale salmon prawns cod oats flour apples bananas berries mango"
+).split()
+DISHES = "curry soup stew salad bake tart pie risotto stir-fry bowl wrap tacos masala dal pilaf gratin".split()
+STYLES = "spicy creamy smoky quick rustic crispy roasted garlicky zesty hearty herby sticky".split()
+STEPS = (
+    "heat the oil in a pan", "add the {0} and cook until soft", "stir in the {0} and {1}",
+    "simmer for ten minutes", "season to taste", "bake until golden", "blend until smooth",
+    "toss the {0} with {1}", "serve with {0}", "roast the {0} until charred",
+)
+QUERIES = ("chickpea curry", "spicy", "roasted cauliflower", "coconut lentil soup", "chick", "salmon rice bowl")
+
+
+def recipe(rng: random.Random, user_id: int) -> SavedRecipe:
+    ingredients = rng.sample(INGREDIENTS, 7)
+    steps = [rng.choice(STEPS).format(*rng.sample(ingredients, 2)) for _ in range(6)]
+    return SavedRecipe(
+        user_id=user_id,
+        name=f"{rng.choice(STYLES).title()} {ingredients[0].title()} {rng.choice(DISHES).title()}",
+        ingredients_available=ingredients[:5],
+        ingredients_needed=ingredients[5:],
+        instructions=[{"step": str(n), "description": step} for n, step in enumerate(steps, 1)],
+        prep_time="15 mins",
+        cook_time="30 mins",
+        total_time="45 mins",
+        servings=4,
+        nutrition={"protein": "12g", "carbs": "40g", "fat": "10g", "sugars": "6g"},
+    )
+
+
+def seed(size: int, rng: random.Random) -> int:
+    db = SessionLocal()
+    user = User(email=f"bench{time.time_ns()}@example.com", hashed_password="x", name="Bench")
+    db.add(user)
+    db.flush()
+    db.add_all(recipe(rng, user.id) for _ in range(size))
+    db.flush()
+    if engine.dialect.name == "postgresql":
+        # What saves do through saved_recipe_search.index_recipes(), for the whole collection at once
+        db.execute(
+            text(f"UPDATE {SavedRecipe.__tablename__} SET search_vector = {SEARCH_VECTOR_SQL} WHERE user_id = :user_id"),
+            {"language": SAVED_SEARCH_LANGUAGE, "user_id": user.id},
+        )
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+async def indexed_search(user_id: int, query: str) -> list:
+    async with AsyncSessionLocal() as db:
+        return await saved_recipe_search.search(db, user_id, query, 20)
+
+
+async def like_scan(user_id: int, query: str) -> list:
+    # Every term somewhere in the name, ingredients or steps, newest first
+    document = cast(SavedRecipe.name, String) + cast(SavedRecipe.ingredients_available, String) \
+        + cast(SavedRecipe.ingredients_needed, String) + cast(SavedRecipe.instructions, String)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(SavedRecipe.id)
+            .where(SavedRecipe.user_id == user_id, and_(*(document.ilike(f"%{term}%") for term in query_terms(query))))
+            .order_by(SavedRecipe.id.desc())
+            .limit(20)
+        )
+        return list(result.scalars())
+
+
+def summary(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    return f"p50 {statistics.median(samples) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms"
+
+
+async def main(sizes: list, requests: int):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    users = {size: seed(size, rng) for size in sizes}
+
+    # Imported late so the settings above are in place
+    from app.main import app
+
+    print(f"search backend: {saved_recipe_search.stats()['backend']} ({engine.dialect.name})")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size, user_id in users.items():
+            headers = {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+            start = time.perf_counter()
+            response = await client.get("/recipes/saved/search", params={"q": QUERIES[0], "limit": 20}, headers=headers)
+            first = time.perf_counter() - start
+            assert response.status_code == 200, response.text
+
+            samples = {"ids, indexed": [], "ids, LIKE scan": [], "GET /saved/search": []}
+            # Interleaved so drift affects every variant equally
+            for i in range(requests):
+                query = QUERIES[i % len(QUERIES)]
+                for name, call in (
+                    ("ids, indexed", lambda: indexed_search(user_id, query)),
+                    ("ids, LIKE scan", lambda: like_scan(user_id, query)),
+                    ("GET /saved/search", lambda: client.get(
+                        "/recipes/saved/search", params={"q": query, "limit": 20}, headers=headers
+                    )),
+                ):
+                    start = time.perf_counter()
+                    await call()
+                    samples[name].append(time.perf_counter() - start)
+            print(f"{size:>6} recipes  first search {first * 1000:8.2f} ms")
+            for name, variant_samples in samples.items():
+                print(f"         {name:<18} {summary(variant_samples)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.requests))
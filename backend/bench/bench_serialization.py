@@ -0,0 +1,177 @@
+"""Serialization CPU time and bytes on the wire for a user with 500 saved recipes.
+
+First encodes the same 500-recipe payload through three pipelines served by a
+bare FastAPI app: response_model validation with FastAPI's own serializer, no
+response_model (jsonable_encoder + json.dumps), and FastJSONResponse returned
+directly (orjson, no re-validation). Then fetches all 500 recipes from the real
+/recipes/saved route with identity, gzip and br encodings.
+
+Run from backend/:  python -m bench.bench_serialization --recipes 500 --requests 30
+Uses a throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("SAVED_RECIPES_MAX_PAGE_SIZE", "500")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from fastapi import FastAPI
+from app.auth import create_access_token
+from app.database import Base, SessionLocal, engine
+from app.models import SavedRecipe, SavedRecipeVideo, SavedYouTubeVideo, User
+from app.responses import FastJSONResponse
+from app.routes.recipe import saved_recipe_response
+from app.schemas import SavedRecipeOut
+
+# Words drawn with natural frequencies from real prose, so text compresses roughly like real descriptions;
+# a small made-up vocabulary compresses far too well, and copied runs give long repeats real data lacks
+WORDS = re.findall(r"[A-Za-z][a-z']+", inspect.getsource(argparse))
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(recipes: int, rng: random.Random) -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email=f"bench{time.time_ns()}@example.com", hashed_password="x", name="Bench")
+    db.add(user)
+    db.flush()
+    for i in range(recipes):
+        recipe = SavedRecipe(
+            user_id=user.id,
+            name=f"{text(rng, 3).title()} {i}",
+            ingredients_available=[text(rng, 2) for _ in range(6)],
+            ingredients_needed=[text(rng, 2) for _ in range(3)],
+            instructions=[{"step": str(n), "description": text(rng, 25)} for n in range(1, 9)],
+            prep_time="15 mins",
+            cook_time="30 mins",
+            total_time="45 mins",
+            servings=4,
+            nutrition={"protein": "12g", "carbs": "40g", "fat": "10g", "sugars": "6g"},
+        )
+        db.add(recipe)
+        db.flush()
+        video_ids = [f"vid{i:05d}{k}" for k in range(4)]
+        db.add_all(
+            SavedYouTubeVideo(
+                video_id=video_id,
+                title=text(rng, 8),
+                # Full descriptions, not the search snippet
+                description=text(rng, 180),
+                thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                channel_title=text(rng, 2).title(),
+                published_at="2024-05-01T12:00:00Z",
+            )
+            for video_id in video_ids
+        )
+        db.flush()
+        db.add_all(
+            SavedRecipeVideo(recipe_id=recipe.id, video_id=video_id, position=k)
+            for k, video_id in enumerate(video_ids)
+        )
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def load_payload(user_id: int) -> list:
+    db = SessionLocal()
+    try:
+        recipes = db.query(SavedRecipe).filter(SavedRecipe.user_id == user_id).order_by(SavedRecipe.id).all()
+        return [
+            saved_recipe_response(recipe, [
+                {
+                    "video_id": video.video_id,
+                    "title": video.title,
+                    "description": video.description,
+                    "thumbnail_url": video.thumbnail_url,
+                    "channel_title": video.channel_title,
+                    "published_at": video.published_at,
+                }
+                for video in recipe.youtube_videos
+            ])
+            for recipe in recipes
+        ]
+    finally:
+        db.close()
+
+
+def pipeline_app(payload: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=List[SavedRecipeOut])
+    async def response_model():
+        return payload
+
+    @app.get("/no-model")
+    async def no_model():
+        return payload
+
+    @app.get("/fast-json", response_model=List[SavedRecipeOut])
+    async def fast_json():
+        return FastJSONResponse(payload)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int, headers: dict = None) -> tuple:
+    wall, cpu = [], []
+    response = await client.get(path, headers=headers)
+    for _ in range(requests):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        response = await client.get(path, headers=headers)
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+        assert response.status_code == 200, response.text
+    return statistics.median(wall), statistics.median(cpu), response
+
+
+async def main(recipes: int, requests: int):
+    user_id = seed(recipes, random.Random(42))
+    payload = load_payload(user_id)
+
+    print(f"pipelines, {len(payload)} recipes (median per request):")
+    transport = httpx.ASGITransport(app=pipeline_app(payload))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/response-model", "/no-model", "/fast-json"):
+            wall, cpu, response = await measure(client, path, requests)
+            print(f"  {path:<16} wall {wall * 1000:7.1f} ms   cpu {cpu * 1000:7.1f} ms   {len(response.content):>9} bytes")
+
+    # Imported late so the settings above are in place
+    from app.main import app
+
+    print(f"GET /recipes/saved?limit={recipes} through the app (median per request):")
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for encoding in ("identity", "gzip", "br"):
+            wall, cpu, response = await measure(
+                client, f"/recipes/saved?limit={recipes}", requests, {"Accept-Encoding": encoding}
+            )
+            assert len(response.json()) == len(payload)
+            on_wire = int(response.headers.get("content-length", len(response.content)))
+            print(f"  {encoding:<16} wall {wall * 1000:7.1f} ms   cpu {cpu * 1000:7.1f} ms   {on_wire:>9} bytes on the wire")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.recipes, args.requests))
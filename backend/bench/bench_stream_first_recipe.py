@@ -0,0 +1,44 @@
+"""Compare time-to-first-recipe for buffered vs streamed generation.
+
+Run from backend/:  python -m bench.bench_stream_first_recipe --latency 4 --recipes 2
+"""
+import argparse
+import asyncio
+import json
+import time
+from app.gemini import GeminiClient
+from app.recipe_stream import RecipeStreamParser
+from bench.fake_gemini import AsyncFakeGeminiModel
+
+
+async def buffered(client: GeminiClient) -> float:
+    start = time.perf_counter()
+    text = await client.generate_text("prompt")
+    json.loads(text)["recipes"][0]
+    return time.perf_counter() - start
+
+
+async def streamed(client: GeminiClient) -> float:
+    start = time.perf_counter()
+    parser = RecipeStreamParser()
+    async for chunk in client.stream_text("prompt"):
+        if parser.feed(chunk):
+            return time.perf_counter() - start
+    raise RuntimeError("stream finished without a recipe")
+
+
+async def run(latency: float, recipes: int):
+    client = GeminiClient(model=AsyncFakeGeminiModel(latency=latency, recipe_count=recipes))
+    buffered_ttfr = await buffered(client)
+    streamed_ttfr = await streamed(client)
+    print(f"latency={latency}s recipes={recipes}")
+    print(f"buffered first recipe: {buffered_ttfr:.2f}s")
+    print(f"streamed first recipe: {streamed_ttfr:.2f}s ({streamed_ttfr / buffered_ttfr:.0%} of buffered)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=4.0)
+    parser.add_argument("--recipes", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency, args.recipes))
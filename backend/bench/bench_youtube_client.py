@@ -0,0 +1,59 @@
+"""Show connection reuse and cache hits for the pooled YouTube client.
+
+Run from backend/:  python -m bench.bench_youtube_client --searches 200 --names 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# Nothing here touches the database, but importing the app needs a URL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.cache import TTLCache
+from app.youtube import YouTubeClient
+from bench.fake_youtube import start_fake_youtube
+
+DISHES = ["Paneer Butter Masala", "Aloo Gobi", "Chana Masala", "Veg Pulao", "Tomato Soup"]
+
+
+async def run(searches: int, names: int, concurrency: int, latency: float):
+    server = start_fake_youtube(latency=latency)
+    pool = [f"{random.choice(DISHES)} {i}" for i in range(names)]
+    # Same dish written with varying case/spacing still hits the same cache entry
+    queries = [random.choice(pool) for _ in range(searches)]
+    queries = [q.upper() if i % 3 == 0 else f"  {q} " for i, q in enumerate(queries)]
+
+    client = YouTubeClient(
+        api_key="fake",
+        base_url=server.base_url,
+        max_connections=concurrency,
+        cache=TTLCache(max_entries=1024, ttl_seconds=3600)
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            await client.search(query)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    server.shutdown()
+
+    stats = client.cache.stats()
+    print(f"searches={searches} distinct_names={names} concurrency={concurrency} elapsed={elapsed:.2f}s")
+    print(f"upstream requests={server.requests} tcp connections={server.connections}")
+    print(f"cache hits={stats['hits']} misses={stats['misses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--names", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.searches, args.names, args.concurrency, args.latency))
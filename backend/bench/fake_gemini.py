@@ -0,0 +1,256 @@
+"""Stand-ins for the Gemini API.
+
+In-process fakes (FakeGeminiModel, AsyncFakeGeminiModel) replace the SDK model
+object directly. FakeGeminiServer is an HTTP stand-in for the REST
+generateContent / streamGenerateContent endpoints, and HttpGeminiModel is the
+model object that talks to it, so benchmarks pay a real network hop.
+
+Run standalone with:  python -m bench.fake_gemini --port 8766 --latency 1.0
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def sample_recipes(count: int = 2) -> dict:
+    return {
+        "recipes": [
+            {
+                "name": f"Sample Recipe {i + 1}",
+                "ingredients": {
+                    "available": ["potato", "onion"],
+                    "needed": ["salt", "pepper"]
+                },
+                "instructions": [
+                    {"step": "1", "description": "Chop the vegetables"},
+                    {"step": "2", "description": "Cook until tender"}
+                ],
+                "prep_time": "10 mins",
+                "cook_time": "20 mins",
+                "total_time": "30 mins",
+                "servings": 2,
+                "nutrition": {"protein": "5g", "carbs": "30g", "fat": "8g", "sugars": "3g"}
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def split_chunks(text: str, chunk_size: int = 64) -> list:
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token, close enough for usage accounting
+    return max(len(text) // 4, 1)
+
+
+class FakeUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+def fake_usage(prompt: str, text: str) -> FakeUsage:
+    return FakeUsage(estimate_tokens(prompt), estimate_tokens(text))
+
+
+class FakeResponse:
+    def __init__(self, text: str, usage_metadata: FakeUsage = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeGeminiModel:
+    """Stand-in for genai.GenerativeModel that sleeps instead of calling Google."""
+
+    def __init__(self, latency: float = 1.0, recipe_count: int = 2):
+        self.latency = latency
+        self.recipe_count = recipe_count
+        self.calls = 0
+
+    def _payload(self) -> str:
+        return json.dumps(sample_recipes(self.recipe_count))
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        payload = self._payload()
+        return FakeResponse(payload, fake_usage(prompt, payload))
+
+
+class FakeStream:
+    """Yields the payload in small chunks spread evenly over the model latency."""
+
+    def __init__(self, text: str, latency: float, chunk_size: int = 64, usage: FakeUsage = None):
+        self.chunks = split_chunks(text, chunk_size)
+        self.delay = latency / max(len(self.chunks), 1)
+        self.usage = usage
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self.chunks):
+            await asyncio.sleep(self.delay)
+            # Like the real API, usage totals ride on the last chunk
+            yield FakeResponse(chunk, self.usage if i == len(self.chunks) - 1 else None)
+
+
+class AsyncFakeGeminiModel(FakeGeminiModel):
+    """Fake that also exposes the native async API like the real SDK."""
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        payload = self._payload()
+        if stream:
+            return FakeStream(payload, self.latency, usage=fake_usage(prompt, payload))
+        await asyncio.sleep(self.latency)
+        return FakeResponse(payload, fake_usage(prompt, payload))
+
+
+def candidate_payload(text: str, usage: FakeUsage = None) -> dict:
+    payload = {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+    if usage is not None:
+        payload["usageMetadata"] = {
+            "promptTokenCount": usage.prompt_token_count,
+            "candidatesTokenCount": usage.candidates_token_count,
+            "totalTokenCount": usage.total_token_count,
+        }
+    return payload
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 1.0, recipe_count: int = 2):
+        super().__init__(address, FakeGeminiHandler)
+        self.latency = latency
+        self.recipe_count = recipe_count
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.count_request()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+        text = json.dumps(sample_recipes(self.server.recipe_count))
+        usage = fake_usage(prompt, text)
+
+        if ":streamGenerateContent" in self.path:
+            self._stream(text, usage)
+        elif ":generateContent" in self.path:
+            time.sleep(self.server.latency)
+            self._send_json(200, candidate_payload(text, usage))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def _send_json(self, status_code: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, text: str, usage: FakeUsage):
+        # Server-sent events, one candidate chunk per event, spread over the latency
+        chunks = split_chunks(text)
+        delay = self.server.latency / max(len(chunks), 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, chunk in enumerate(chunks):
+            time.sleep(delay)
+            payload = candidate_payload(chunk, usage if i == len(chunks) - 1 else None)
+            event = f"data: {json.dumps(payload)}\r\n\r\n".encode()
+            self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_gemini(port: int = 0, latency: float = 1.0, recipe_count: int = 2) -> FakeGeminiServer:
+    server = FakeGeminiServer(("127.0.0.1", port), latency=latency, recipe_count=recipe_count)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def candidate_text(payload: dict) -> str:
+    parts = payload["candidates"][0]["content"]["parts"]
+    return "".join(part.get("text", "") for part in parts)
+
+
+def response_from_payload(payload: dict) -> FakeResponse:
+    usage = payload.get("usageMetadata")
+    if usage is not None:
+        usage = FakeUsage(usage.get("promptTokenCount", 0), usage.get("candidatesTokenCount", 0))
+    return FakeResponse(candidate_text(payload), usage)
+
+
+class HttpStream:
+    def __init__(self, client, url: str, body: dict):
+        self.client = client
+        self.url = url
+        self.body = body
+
+    async def __aiter__(self):
+        async with self.client.stream("POST", self.url, params={"alt": "sse"}, json=self.body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    yield response_from_payload(json.loads(line[len("data: "):]))
+
+
+class HttpGeminiModel:
+    """Model object for GeminiClient that calls a FakeGeminiServer over HTTP."""
+
+    def __init__(self, base_url: str, model: str = "fake-model", max_connections: int = 100):
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(120.0)
+        )
+
+    def _url(self, method: str) -> str:
+        return f"{self.base_url}/v1beta/models/{self.model}:{method}"
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        body = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": generation_config or {}}
+        if stream:
+            return HttpStream(self.client, self._url("streamGenerateContent"), body)
+        response = await self.client.post(self._url("generateContent"), json=body)
+        response.raise_for_status()
+        return response_from_payload(response.json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--recipes", type=int, default=2)
+    args = parser.parse_args()
+    server = FakeGeminiServer(("127.0.0.1", args.port), latency=args.latency, recipe_count=args.recipes)
+    print(f"Fake Gemini API listening on {server.base_url}")
+    server.serve_forever()
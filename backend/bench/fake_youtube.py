@@ -0,0 +1,93 @@
+"""Local stand-in for the YouTube Data API search endpoint.
+
+Run standalone with:  python -m bench.fake_youtube --port 8765 --latency 0.1
+then point the app at it with YOUTUBE_API_BASE_URL=http://127.0.0.1:8765
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def search_payload(query: str, count: int = 4) -> dict:
+    return {
+        "items": [
+            {
+                "id": {"videoId": f"vid{i}-{abs(hash(query)) % 10000}"},
+                "snippet": {
+                    "title": f"{query} #{i + 1}",
+                    "description": f"How to cook {query}",
+                    "thumbnails": {"high": {"url": f"https://img.example/{i}.jpg"}},
+                    "channelTitle": "Fake Kitchen",
+                    "publishedAt": "2024-01-01T00:00:00Z"
+                }
+            }
+            for i in range(count)
+        ]
+    }
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0):
+        super().__init__(address, FakeYouTubeHandler)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_GET(self):
+        self.server.count("requests")
+        url = urlparse(self.path)
+        if url.path.rstrip("/").endswith("/search"):
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            query = parse_qs(url.query).get("q", [""])[0]
+            body = json.dumps(search_payload(query)).encode()
+            self.send_response(200)
+        else:
+            body = b'{"error": "not found"}'
+            self.send_response(404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_youtube(port: int = 0, latency: float = 0.0) -> FakeYouTubeServer:
+    server = FakeYouTubeServer(("127.0.0.1", port), latency=latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    server = FakeYouTubeServer(("127.0.0.1", args.port), latency=args.latency)
+    print(f"Fake YouTube API listening on {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,356 @@
+"""Mixed-workload load test of the whole API against local Gemini and YouTube stand-ins.
+
+Starts a FakeGeminiServer and a FakeYouTubeServer, runs the app in a uvicorn
+subprocess (bench.serve) against SQLite or the given database, then drives a
+weighted mix of login, inventory, generate, youtube-search, save and
+list-saved calls from N concurrent virtual users. Per-endpoint p50/p95/p99 and
+throughput are written to a JSON file so runs can be compared across commits.
+
+Run from backend/:
+    python -m bench.load_test --concurrency 32 --duration 30 --output load-test.json
+    python -m bench.load_test --database-url postgresql://user:pw@localhost/recipes
+    python -m bench.load_test --baseline load-test-old.json   # prints deltas
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from bench.fake_gemini import sample_recipes, start_fake_gemini
+from bench.fake_youtube import search_payload, start_fake_youtube
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVENTORY_PATH = os.path.join(BACKEND_DIR, "app", "inventory.json")
+DEFAULT_MIX = "login=1,inventory=4,generate=2,youtube_search=2,save=2,list_saved=4"
+PASSWORD = "bench-password"
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def inventory_names() -> list:
+    with open(INVENTORY_PATH) as file:
+        data = json.load(file)
+    return [item if isinstance(item, str) else item["name"] for items in data.values() for item in items]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Workload:
+    """Shared fixtures for the virtual users: ingredient sets, recipe names and a saveable recipe."""
+
+    def __init__(self, ingredient_sets: int, seed: int):
+        rng = random.Random(seed)
+        names = inventory_names()
+        # A bounded pool of pantries, so the generate mix has a realistic cache hit rate
+        self.ingredient_sets = [rng.sample(names, rng.randint(2, 6)) for _ in range(ingredient_sets)]
+        self.recipe_names = [" ".join(rng.sample(names, 2)) + " curry" for _ in range(ingredient_sets)]
+
+        recipe = sample_recipes(1)["recipes"][0]
+        videos = [
+            {
+                "video_id": item["id"]["videoId"],
+                "title": item["snippet"]["title"],
+                "description": item["snippet"]["description"],
+                "thumbnail_url": item["snippet"]["thumbnails"]["high"]["url"],
+                "channel_title": item["snippet"]["channelTitle"],
+                "published_at": item["snippet"]["publishedAt"],
+            }
+            for item in search_payload(recipe["name"], count=3)["items"]
+        ]
+        self.saved_recipe = {**recipe, "youtube_videos": videos}
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, workload: Workload, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.workload = workload
+        self.rng = rng
+        self.headers = {}
+
+    async def signup(self):
+        response = await self.client.post(
+            "/users/signup", json={"email": self.email, "password": PASSWORD, "name": "Bench"}
+        )
+        if response.status_code not in (200, 400):  # 400: already registered on a reused database
+            response.raise_for_status()
+        await self.login()
+
+    async def login(self):
+        response = await self.client.post("/users/login", json={"email": self.email, "password": PASSWORD})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def inventory(self):
+        return await self.client.get("/inventory/", headers=self.headers)
+
+    async def generate(self):
+        ingredients = self.rng.choice(self.workload.ingredient_sets)
+        return await self.client.post("/recipes/generate", json={"ingredients": ingredients}, headers=self.headers)
+
+    async def youtube_search(self):
+        name = self.rng.choice(self.workload.recipe_names)
+        return await self.client.post("/recipes/youtube-search", json={"recipe_name": name}, headers=self.headers)
+
+    async def save(self):
+        return await self.client.post("/recipes/save", json=self.workload.saved_recipe, headers=self.headers)
+
+    async def list_saved(self):
+        return await self.client.get("/recipes/saved", params={"limit": 50}, headers=self.headers)
+
+
+OPERATIONS = {
+    "login": VirtualUser.login,
+    "inventory": VirtualUser.inventory,
+    "generate": VirtualUser.generate,
+    "youtube_search": VirtualUser.youtube_search,
+    "save": VirtualUser.save,
+    "list_saved": VirtualUser.list_saved,
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def record(self, operation: str, seconds: float, status):
+        self.latencies[operation].append(seconds)
+        self.statuses[operation][str(status)] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[operation] += 1
+
+
+async def run_user(user: VirtualUser, mix: dict, recorder: Recorder, measure_from: float, stop_at: float):
+    operations = list(mix)
+    weights = [mix[name] for name in operations]
+    while time.monotonic() < stop_at:
+        operation = user.rng.choices(operations, weights)[0]
+        start = time.monotonic()
+        try:
+            response = await OPERATIONS[operation](user)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if start >= measure_from:
+            recorder.record(operation, time.monotonic() - start, status)
+
+
+def summarize(recorder: Recorder, duration: float) -> dict:
+    endpoints = {}
+    all_latencies = []
+    for operation in sorted(recorder.latencies):
+        latencies = sorted(recorder.latencies[operation])
+        all_latencies.extend(latencies)
+        endpoints[operation] = latency_summary(latencies, duration)
+        endpoints[operation]["errors"] = recorder.errors[operation]
+        endpoints[operation]["status_codes"] = dict(recorder.statuses[operation])
+
+    total = latency_summary(sorted(all_latencies), duration)
+    total["errors"] = sum(recorder.errors.values())
+    return {"endpoints": endpoints, "total": total}
+
+
+def latency_summary(latencies: list, duration: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "mean": round(1000 * sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(1000 * percentile(latencies, 50), 2),
+            "p95": round(1000 * percentile(latencies, 95), 2),
+            "p99": round(1000 * percentile(latencies, 99), 2),
+            "max": round(1000 * latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+def start_app(args, port: int, gemini_url: str, youtube_url: str, database_url: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "YOUTUBE_API_BASE_URL": youtube_url,
+        "YOUTUBE_API_KEY": env.get("YOUTUBE_API_KEY", "bench-key"),
+    })
+    if args.bcrypt_rounds:
+        env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    command = [sys.executable, "-m", "bench.serve", "--port", str(port), "--gemini-url", gemini_url, "--seed"]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"App server exited with code {process.returncode}")
+        try:
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("App server did not become ready in time")
+
+
+async def run_load(args, base_url: str, process: subprocess.Popen):
+    workload = Workload(args.ingredient_sets, args.seed)
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.request_timeout) as client:
+        await wait_until_ready(client, process)
+
+        run_id = int(time.time())
+        users = [
+            VirtualUser(client, f"bench{run_id}-{i}@example.com", workload, random.Random(args.seed + i))
+            for i in range(args.users)
+        ]
+        for user in users:
+            await user.signup()
+
+        start = time.monotonic()
+        measure_from = start + args.warmup
+        stop_at = measure_from + args.duration
+        await asyncio.gather(*(
+            run_user(users[i % len(users)], mix, recorder, measure_from, stop_at)
+            for i in range(args.concurrency)
+        ))
+        # In-flight requests finish after stop_at, so measure the real window
+        measured = time.monotonic() - measure_from
+
+    return summarize(recorder, measured), measured
+
+
+def print_report(results: dict, baseline: dict = None):
+    base_endpoints = (baseline or {}).get("endpoints", {})
+    print(f"{'endpoint':<16}{'reqs':>8}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    for name, stats in rows:
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<16}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>9}"
+            f"{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+        )
+        before = baseline["total"] if name == "TOTAL" and baseline else base_endpoints.get(name)
+        if before:
+            deltas = [
+                delta(before["throughput_rps"], stats["throughput_rps"]),
+                *(delta(before["latency_ms"][p], latency[p]) for p in ("p50", "p95", "p99")),
+            ]
+            print(f"{'  vs baseline':<30}" + "".join(f"{d:>10}" for d in deltas))
+
+
+def delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{100 * (after - before) / before:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--users", type=int, default=8, help="Distinct accounts shared by the workers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted operations, e.g. 'inventory=4,generate=1'")
+    parser.add_argument("--ingredient-sets", type=int, default=50, help="Distinct pantries/recipe names in play")
+    parser.add_argument("--gemini-latency", type=float, default=1.0)
+    parser.add_argument("--youtube-latency", type=float, default=0.1)
+    parser.add_argument("--bcrypt-rounds", type=int, help="Override BCRYPT_ROUNDS for the app")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="load-test-results.json")
+    parser.add_argument("--baseline", help="Earlier results file to print deltas against")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/load-test.db"
+    gemini = start_fake_gemini(latency=args.gemini_latency)
+    youtube = start_fake_youtube(latency=args.youtube_latency)
+    port = free_port()
+    process = start_app(args, port, gemini.base_url, youtube.base_url, database_url)
+
+    try:
+        summary, measured = asyncio.run(run_load(args, f"http://127.0.0.1:{port}", process))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": database_url.split(":", 1)[0].split("+", 1)[0],
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "duration_seconds": round(measured, 2),
+            "warmup_seconds": args.warmup,
+            "mix": parse_mix(args.mix),
+            "ingredient_sets": args.ingredient_sets,
+            "gemini_latency_seconds": args.gemini_latency,
+            "youtube_latency_seconds": args.youtube_latency,
+        },
+        "upstream": {"gemini_requests": gemini.requests, "youtube_requests": youtube.requests},
+        **summary,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    print_report(results, baseline)
+    print(f"upstream calls: gemini={gemini.requests} youtube={youtube.requests}")
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
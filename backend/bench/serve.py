@@ -0,0 +1,44 @@
+"""Run the API under uvicorn with Gemini pointed at a FakeGeminiServer.
+
+Used by bench.load_test, which starts this as a subprocess. Run it by hand with:
+    python -m bench.serve --port 8000 --gemini-url http://127.0.0.1:8766 --seed
+and set DATABASE_URL / YOUTUBE_API_BASE_URL in the environment first.
+"""
+import argparse
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--gemini-url", required=True)
+    parser.add_argument("--seed", action="store_true", help="Upsert the bundled inventory before serving")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("YOUTUBE_API_KEY", "bench-key")
+    # A handful of virtual users drive all the load; per-user limits would just turn it into 429s
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    # Settings are read at import time, so the app is imported only after the environment is final
+    import uvicorn
+    from app.database import Base, engine
+    from app.gemini import gemini_client
+    from app.main import app
+    from bench.fake_gemini import HttpGeminiModel
+
+    gemini_client._model = HttpGeminiModel(args.gemini_url)
+    if args.seed:
+        from app.seed_inventory import seed_inventory
+
+        Base.metadata.create_all(bind=engine)
+        seed_inventory()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,14 @@ export async function GET(request) {
       );
     }
 
-    const response = await fetch(`${process.env.NEXT_PUBLIC_API_BASE_URL}/recipes/saved`, {
+    // One page per call; the client asks for the next one with the cursor passed back in X-Next-Cursor
+    const url = new URL(`${process.env.NEXT_PUBLIC_API_BASE_URL}/recipes/saved`);
+    const cursor = request.nextUrl.searchParams.get('cursor');
+    if (cursor) {
+      url.searchParams.set('cursor', cursor);
+    }
+
+    const response = await fetch(url, {
       method: 'GET',
       headers: {
         'Authorization': `Bearer ${token}`,
@@ -25,7 +32,11 @@ export async function GET(request) {
       throw new Error(data.message || 'Failed to fetch saved recipes');
     }
 
-    return NextResponse.json(data, { status: 200 });
+    const nextCursor = response.headers.get('X-Next-Cursor');
+    return NextResponse.json(data, {
+      status: 200,
+      headers: nextCursor ? { 'X-Next-Cursor': nextCursor } : {},
+    });
 
   } catch (error) {
     return NextResponse.json(
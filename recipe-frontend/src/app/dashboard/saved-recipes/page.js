@@ -48,22 +48,35 @@ export default function SavedRecipesPage() {
   const [recipes, setRecipes] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [loadMoreError, setLoadMoreError] = useState(null);
   const [expandedRecipeId, setExpandedRecipeId] = useState(null);
   const [videoScrollPositions, setVideoScrollPositions] = useState({});
   const [mobileExpandedSections, setMobileExpandedSections] = useState({});
 
+  // Fetches one page of saved recipes; the cursor for the page after it comes back in X-Next-Cursor
+  const fetchSavedRecipesPage = async (cursor) => {
+    const url = cursor
+      ? `/api/get-saved-recipes?cursor=${encodeURIComponent(cursor)}`
+      : '/api/get-saved-recipes';
+    const response = await fetch(url);
+    const data = await response.json();
+
+    if (!response.ok) {
+      throw new Error(data.error || 'Failed to fetch saved recipes');
+    }
+
+    return { page: data, cursor: response.headers.get('X-Next-Cursor') };
+  };
+
   useEffect(() => {
     const fetchSavedRecipes = async () => {
       try {
         setLoading(true);
-        const response = await fetch('/api/get-saved-recipes');
-        const data = await response.json();
-
-        if (!response.ok) {
-          throw new Error(data.error || 'Failed to fetch saved recipes');
-        }
-
-        setRecipes(data);
+        const { page, cursor } = await fetchSavedRecipesPage(null);
+        setRecipes(page);
+        setNextCursor(cursor);
       } catch (err) {
         setError(err.message || 'Failed to load saved recipes');
       } finally {
@@ -74,6 +87,21 @@ export default function SavedRecipesPage() {
     fetchSavedRecipes();
   }, []);
 
+  const loadMoreRecipes = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      setLoadMoreError(null);
+      const { page, cursor } = await fetchSavedRecipesPage(nextCursor);
+      setRecipes(prev => [...prev, ...page]);
+      setNextCursor(cursor);
+    } catch (err) {
+      setLoadMoreError(err.message || 'Failed to load more recipes');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const toggleRecipeExpand = (recipeId) => {
     setExpandedRecipeId(expandedRecipeId === recipeId ? null : recipeId);
   };
@@ -432,6 +460,21 @@ export default function SavedRecipesPage() {
           })}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="mt-6 sm:mt-8 flex flex-col items-center gap-2">
+          {loadMoreError && (
+            <p className="text-red-600 text-sm">{loadMoreError}</p>
+          )}
+          <button
+            onClick={loadMoreRecipes}
+            disabled={loadingMore}
+            className="px-5 py-2 rounded-lg bg-gradient-to-r from-amber-500 to-orange-500 text-white font-medium text-sm sm:text-base shadow-sm hover:shadow-md transition-all disabled:opacity-60 cursor-pointer"
+          >
+            {loadingMore ? 'Loading...' : 'Load more recipes'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file